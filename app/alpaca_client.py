@@ -1,7 +1,9 @@
 from alpaca.trading.client import TradingClient
 from alpaca.trading.requests import MarketOrderRequest
 from alpaca.trading.enums import OrderSide, TimeInForce
+import aiohttp
 import logging
+from app.fmp_client import get_shared_session
 
 logger = logging.getLogger(__name__)
 
@@ -19,10 +21,10 @@ class AlpacaClient:
                 time_in_force=TimeInForce.DAY
             )
             order = self.client.submit_order(order_data)
-            logger.info(f"Bought ${amount} of {symbol}")
+            logger.info("Bought $%s of %s", amount, symbol)
             return order
         except Exception as e:
-            logger.error(f"Failed to buy {symbol}: {e}")
+            logger.error("Failed to buy %s: %s", symbol, e)
             raise
     
     def get_positions(self):
@@ -33,6 +35,40 @@ class AlpacaClient:
         """Get account info"""
         return self.client.get_account()
 
+class AsyncAlpacaClient:
+    """Order submission over the shared aiohttp session, so many copy trades
+    can be in flight at once instead of blocking one after another."""
+
+    PAPER_URL = "https://paper-api.alpaca.markets"
+    LIVE_URL = "https://api.alpaca.markets"
+
+    def __init__(self, api_key: str, secret_key: str, paper: bool = True):
+        self.base_url = self.PAPER_URL if paper else self.LIVE_URL
+        self.headers = {
+            "APCA-API-KEY-ID": api_key,
+            "APCA-API-SECRET-KEY": secret_key
+        }
+
+    async def buy_stock(self, symbol: str, amount: float) -> dict:
+        """Buy stock with dollar amount; returns Alpaca's order JSON"""
+        session = await get_shared_session()
+        order_data = {
+            "symbol": symbol,
+            "notional": str(round(amount, 2)),
+            "side": "buy",
+            "type": "market",
+            "time_in_force": "day"
+        }
+        try:
+            async with session.post(f"{self.base_url}/v2/orders", json=order_data, headers=self.headers) as response:
+                response.raise_for_status()
+                order = await response.json()
+            logger.info("Bought $%s of %s", amount, symbol)
+            return order
+        except aiohttp.ClientError as e:
+            logger.error("Failed to buy %s: %s", symbol, e)
+            raise
+
 def test_alpaca_connection():
     """Test Alpaca connection"""
     from app.config import get_settings
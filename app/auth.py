@@ -1,27 +1,58 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 import secrets
 import hashlib
+import bcrypt
+import threading
+import time
+import orjson
+from cachetools import TTLCache
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
 
 from app.config import get_settings
 from app.database import get_db
+from app.cache import cache_get, cache_set, cache_delete
 from app.models import User
 
 settings = get_settings()
 
-pwd_context = CryptContext(schemes = ["bcrypt"], deprecated = "auto")
-
 security = HTTPBearer()
 
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Short-lived caches for the auth hot path: decoded JWT payloads keyed by the
+# token digest, and user column snapshots keyed by email. Invalidation only
+# reaches this process and Redis, so the in-process snapshot TTL is the
+# window in which other workers may still see a deactivated user or an old
+# password; keep it to seconds. The longer-lived copy lives in Redis.
+_token_cache = TTLCache(maxsize = 10000, ttl = settings.AUTH_CACHE_TTL_SECONDS)
+_user_cache = TTLCache(maxsize = 5000, ttl = settings.USER_LOCAL_CACHE_TTL_SECONDS)
+_cache_lock = threading.Lock()
+
+# Successful password checks only, so a client re-authing within a few
+# seconds does not pay for another bcrypt round
+_password_cache = TTLCache(maxsize = 2048, ttl = 30)
+
+# Snapshots leave the process (Redis), so the password hash stays out of them
+_SNAPSHOT_COLUMNS = tuple(column.key for column in User.__table__.columns if column.key != "hashed_password")
+_SNAPSHOT_DATETIME_COLUMNS = tuple(
+    column.key for column in User.__table__.columns if isinstance(column.type, DateTime)
+)
+
+def _cache_key(*parts: str) -> bytes:
+    # sha256 measured faster than blake2b here (SHA-NI); update() avoids
+    # building a concatenated copy of the inputs
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+    return digest.digest()
+
 class UserCreate(BaseModel):
     email: EmailStr
     password: str
@@ -45,10 +76,20 @@ class UserResponse(BaseModel):
         from_attributes: True
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    cache_key = _cache_key(plain_password, hashed_password)
+    with _cache_lock:
+        if cache_key in _password_cache:
+            return True
+
+    if not bcrypt.checkpw(plain_password.encode(), hashed_password.encode()):
+        return False
+
+    with _cache_lock:
+        _password_cache[cache_key] = True
+    return True
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds = settings.BCRYPT_ROUNDS)).decode()
 
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
@@ -59,7 +100,17 @@ def create_access_token(data: dict) -> str:
 
     return encoded_jwt
 
-def verify_token(token:str) -> dict:
+def verify_token(token:str) -> Tuple[dict, str]:
+    cache_key = _cache_key(token)
+    now = time.time()
+
+    with _cache_lock:
+        cached = _token_cache.get(cache_key)
+    if cached is not None:
+        payload, email, expires_at = cached
+        if now < expires_at:
+            return payload, email
+
     try:
         payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -68,16 +119,56 @@ def verify_token(token:str) -> dict:
                 status_code = status.HTTP_401_UNAUTHORIZED,
                 detail = "Invalid token"
             )
-        return payload
     except JWTError:
         raise HTTPException(
             status_code = status.HTTP_401_UNAUTHORIZED,
             detail = "Invalid token"
         )
 
+    # Never serve a cached payload past the token's own expiry
+    expires_at = min(now + settings.AUTH_CACHE_TTL_SECONDS, payload.get("exp", now))
+    with _cache_lock:
+        _token_cache[cache_key] = (payload, email, expires_at)
+    return payload, email
+
+def _user_snapshot(user: User) -> dict:
+    return {key: getattr(user, key) for key in _SNAPSHOT_COLUMNS}
+
+def _load_shared_snapshot(email: str) -> Optional[dict]:
+    # Shared across workers so one process's login warms the others
+    raw = cache_get(f"user:{email}")
+    if raw is None:
+        return None
+    snapshot = orjson.loads(raw)
+    for key in _SNAPSHOT_DATETIME_COLUMNS:
+        if snapshot.get(key):
+            snapshot[key] = datetime.fromisoformat(snapshot[key])
+    return snapshot
+
+def invalidate_cached_user(email: str):
+    # Other workers drop their own copy when USER_LOCAL_CACHE_TTL_SECONDS runs out
+    with _cache_lock:
+        _user_cache.pop(email, None)
+    cache_delete(f"user:{email}")
+
+@event.listens_for(User, "after_update")
+def _invalidate_user_on_update(mapper, connection, target):
+    # Password changes and deactivation must not be masked by a stale snapshot
+    invalidate_cached_user(target.email)
+    for old_email in inspect(target).attrs.email.history.deleted:
+        invalidate_cached_user(old_email)
+
+def clear_auth_caches():
+    with _cache_lock:
+        _token_cache.clear()
+        _user_cache.clear()
+        _password_cache.clear()
+
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
+# Sync like the other DB helpers: callers are plain def endpoints, so the
+# query, commit and bcrypt all run on the threadpool (bcrypt releases the GIL)
 def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
     user = get_user_by_email(db, email)
     if not user:
@@ -116,22 +207,32 @@ def get_current_user(
             detail = "Could not validate credentials",
             headers = {"WWW-Authenticate": "Bearer"}
         )
-    
-    try:    
-        token = credentials.credentials
-        payload = verify_token(token)
-        email: str = payload.get("sub")
 
-        if email is None:
+    _, email = verify_token(credentials.credentials)
+
+    with _cache_lock:
+        snapshot = _user_cache.get(email)
+
+    if snapshot is None:
+        snapshot = _load_shared_snapshot(email)
+        if snapshot is not None:
+            with _cache_lock:
+                _user_cache[email] = snapshot
+
+    if snapshot is not None:
+        # Detached copy built from cached column values, no DB roundtrip.
+        # Given an identity, db.add()/merge() attach it to the existing row
+        # instead of inserting a duplicate; hashed_password stays unloaded
+        user = User(**snapshot)
+        make_transient_to_detached(user)
+    else:
+        user = get_user_by_email(db, email)
+        if user is None:
             raise credentials_exception
-        
-
-    except JWTError:
-        raise credentials_exception
-    
-    user = get_user_by_email(db, email)
-    if user is None:
-        raise credentials_exception
+        snapshot = _user_snapshot(user)
+        with _cache_lock:
+            _user_cache[email] = snapshot
+        cache_set(f"user:{email}", orjson.dumps(snapshot), settings.USER_CACHE_TTL_SECONDS)
     
     if not user.is_active:
         raise HTTPException(
@@ -0,0 +1,112 @@
+import functools
+import logging
+import time
+from typing import Optional
+import orjson
+import redis
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+CACHE_PREFIX = "ct"
+
+# After a Redis error, serve straight from the database for this long
+# instead of paying a connect timeout on every request
+_RETRY_AFTER_SECONDS = 30
+
+_client = None
+_down_until = 0.0
+
+def get_redis() -> redis.Redis:
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.CACHE_REDIS_URL,
+            socket_connect_timeout = 0.5,
+            socket_timeout = 0.5
+        )
+    return _client
+
+def close_redis():
+    global _client
+    if _client is not None:
+        _client.close()
+        _client = None
+
+def _available() -> bool:
+    return settings.CACHE_ENABLED and time.monotonic() >= _down_until
+
+def _mark_down(exc: Exception):
+    global _down_until
+    _down_until = time.monotonic() + _RETRY_AFTER_SECONDS
+    logger.warning("Redis cache unavailable, bypassing for %ss: %s", _RETRY_AFTER_SECONDS, exc)
+
+def cache_get(key: str) -> Optional[bytes]:
+    if not _available():
+        return None
+    try:
+        return get_redis().get(f"{CACHE_PREFIX}:{key}")
+    except redis.RedisError as exc:
+        _mark_down(exc)
+        return None
+
+def cache_set(key: str, value: bytes, expire: int):
+    if not _available():
+        return
+    try:
+        get_redis().set(f"{CACHE_PREFIX}:{key}", value, ex = expire)
+    except redis.RedisError as exc:
+        _mark_down(exc)
+
+def cache_delete(*keys: str):
+    if not keys or not _available():
+        return
+    try:
+        get_redis().delete(*(f"{CACHE_PREFIX}:{key}" for key in keys))
+    except redis.RedisError as exc:
+        _mark_down(exc)
+
+def _build_key(namespace: str, func, kwargs: dict) -> str:
+    # The db session is per-request and must never take part in the key
+    params = "&".join(f"{k}={v}" for k, v in sorted(kwargs.items()) if k != "db")
+    return f"{namespace}:{func.__module__}.{func.__name__}:{params}"
+
+def cached(expire: int, namespace: str = "api"):
+    """Cache a sync endpoint's JSON-able dict result in Redis for `expire` seconds.
+
+    Fails open: if Redis is down the endpoint is simply called.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _available():
+                return func(*args, **kwargs)
+
+            key = _build_key(namespace, func, kwargs)
+            hit = cache_get(key)
+            if hit is not None:
+                return orjson.loads(hit)
+
+            result = func(*args, **kwargs)
+
+            # Error paths return Response objects; only plain payloads are cached
+            if isinstance(result, dict):
+                cache_set(key, orjson.dumps(result), expire)
+            return result
+        return wrapper
+    return decorator
+
+def clear_namespace(namespace: str = "api") -> int:
+    if not settings.CACHE_ENABLED:
+        return 0
+    try:
+        client = get_redis()
+        keys = list(client.scan_iter(match = f"{CACHE_PREFIX}:{namespace}:*", count = 500))
+        if keys:
+            client.delete(*keys)
+        return len(keys)
+    except redis.RedisError as exc:
+        logger.warning("Failed to clear cache namespace %s: %s", namespace, exc)
+        return 0
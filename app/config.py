@@ -1,7 +1,13 @@
+from functools import lru_cache
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str = ""
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 5
+    DB_POOL_TIMEOUT: int = 5
+    DB_POOL_RECYCLE: int = 1800
+    DB_QUERY_CACHE_SIZE: int = 1200
     FMP_API_KEY: str = ""
     JWT_SECRET_KEY: str = ""
     DEBUG: bool = True 
@@ -18,6 +24,13 @@ class Settings(BaseSettings):
     ALPACA_PAPER_TRADING: bool = True
     ENABLE_TRADING_BOT: bool = False
     MAX_TRADE_AMOUNT: float = 1000.0
+    AUTH_CACHE_TTL_SECONDS: int = 5
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_LOCAL_CACHE_TTL_SECONDS: int = 5
+    BCRYPT_ROUNDS: int = 12
+    REDIS_URL: str = "redis://redis:6379/0"
+    CACHE_ENABLED: bool = True
+    CACHE_REDIS_URL: str = "redis://redis:6379/2"
     
     class Config:
         env_file = ".env" 
@@ -29,7 +42,11 @@ class Settings(BaseSettings):
     def allowed_origins(self) -> list:
         return self.ALLOWED_ORIGINS
 
-settings = Settings()
+@lru_cache(maxsize = 1)
+def get_settings() -> Settings:
+    return Settings()
+
+settings = get_settings()
 
 
 def show_current_settings():
@@ -61,9 +78,6 @@ def is_debug_mode():
 def get_api_key():
     return settings.FMP_API_KEY
 
-def get_settings():
-    return settings
-
 if __name__ == "__main__":
     show_current_settings()
 
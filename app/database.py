@@ -1,21 +1,36 @@
-from sqlalchemy import create_engine, text
+from functools import lru_cache
+from sqlalchemy import create_engine, text, select, func, case, cast, table, column, BigInteger
 from sqlalchemy.orm import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker, scoped_session, Session
 import logging
 from app.config import settings
-from typing import Iterator
+from typing import Iterator, Dict
 
 
 logger = logging.getLogger(__name__)
 
 database_url = settings.DATABASE_URL.replace("postgresql+asyncpg://", "postgresql://")
 
-engine = create_engine(
-    database_url,
-    echo = settings.DEBUG,
-    pool_pre_ping=True,
-    pool_recycle=3600
-)
+# One pool per process. Under gunicorn the pool is sized from the worker
+# count (see gunicorn.conf.py) so all workers together stay inside the
+# database's connection limit; threadpool requests beyond it queue for up to
+# pool_timeout, then fail fast instead of piling up.
+@lru_cache(maxsize = 1)
+def get_engine() -> Engine:
+    return create_engine(
+        database_url,
+        echo = settings.DEBUG and settings.ENVIRONMENT == "development",
+        pool_size = settings.DB_POOL_SIZE,
+        max_overflow = settings.DB_MAX_OVERFLOW,
+        pool_timeout = settings.DB_POOL_TIMEOUT,
+        pool_recycle = settings.DB_POOL_RECYCLE,
+        pool_pre_ping = True,
+        # Compiled-statement LRU; every filter combination is its own entry
+        query_cache_size = settings.DB_QUERY_CACHE_SIZE
+    )
+
+engine = get_engine()
 
 SessionLocal = sessionmaker(
     autocommit = False,
@@ -23,6 +38,10 @@ SessionLocal = sessionmaker(
     bind = engine
 )
 
+# Thread-local sessions for Celery tasks: call TaskSession() for the worker
+# thread's session and TaskSession.remove() when the task is done
+TaskSession = scoped_session(SessionLocal)
+
 Base = declarative_base()
 
 def get_db() -> Iterator[Session]:
@@ -32,11 +51,31 @@ def get_db() -> Iterator[Session]:
 
     except Exception as e:
         db.rollback()
-        logger.error(f"Database session error {e}")
+        logger.error("Database session error %s", e)
         raise
     finally:
         db.close()
 
+_pg_class = table("pg_class", column("oid"), column("reltuples"))
+
+def estimate_row_counts(db: Session, *models) -> Dict[str, int]:
+    """Row counts for status pages, keyed by table name, in one round trip.
+
+    Postgres answers from the planner statistics in pg_class; tables that
+    were never analyzed (reltuples = -1) and other backends get an exact count.
+    """
+    postgres = db.get_bind().dialect.name == "postgresql"
+    columns = []
+    for model in models:
+        exact = select(func.count()).select_from(model).scalar_subquery()
+        if postgres:
+            count = select(
+                case((_pg_class.c.reltuples >= 0, cast(_pg_class.c.reltuples, BigInteger)), else_ = exact)
+            ).where(_pg_class.c.oid == func.to_regclass(model.__tablename__)).scalar_subquery()
+        else:
+            count = exact
+        columns.append(count.label(model.__tablename__))
+    return dict(db.execute(select(*columns)).one()._mapping)
 
 def create_tables():
     try:
@@ -47,41 +86,31 @@ def create_tables():
         return True
 
     except Exception as e:
-        print(f"Failed to create tables {e}")
-        logger.error(f"Failed to create database tabels {e}")
+        logger.error("Failed to create database tabels %s", e)
         return False
 
 def test_connection():
     try:
-        db = SessionLocal()
-        result = db.execute(text("Select 1 as test_column"))
-        test_value = result.fetchone()[0]
-        db.close()
+        with engine.connect() as conn:
+            test_value = conn.execute(text("Select 1 as test_column")).scalar()
 
         if test_value ==1 :
-            print("Connection Successful")
             logger.info("Connection successful")
             return True
         else:
-            print("Connection failed")
+            logger.error("Connection failed: unexpected probe result %s", test_value)
             return False
 
     except Exception as e:
-        print(f"Connection failed {e}")
-        logger.error(f"Connection failed {e}")
+        logger.error("Connection failed %s", e)
         return False
 
 def get_database_info():
     try:
-        db = SessionLocal()
-
-        result = db.execute(text("Select version()"))
-        version = result.fetchone()[0]
-
-        result = db.execute(text("Select current_database()"))
-        db_name = result.fetchone()[0]
-
-        db.close()
+        with engine.connect() as conn:
+            version, db_name = conn.execute(
+                text("Select version(), current_database()")
+            ).fetchone()
 
         return {
             "database_url": database_url,
@@ -92,23 +121,22 @@ def get_database_info():
         }
 
     except Exception as e:
-        logger.error(f"Failed to get database info {e}")
+        logger.error("Failed to get database info %s", e)
         return{"error": str(e)}
 
 def close_database():
     try:
         engine.dispose()
-        print("Connection closed")
         logger.info("Database connection closed")
     except Exception as e:
-        print(f"Error closing connection {e}")
-        logger.error(f"Error closing connection {e}")
+        logger.error("Error closing connection %s", e)
 
 def main():
     if not test_connection():
         print("Connection failed")
         return False
-    
+
+    print("Connection Successful")
     info = get_database_info()
     for key,value in info.items():
         print(f" {key}: {value}")
@@ -45,12 +45,12 @@ def test_individual_imports():
         return False
     
     try:
-        print("5. Testing passlib imports...")
-        from passlib.context import CryptContext
-        print("   ✅ passlib imports OK")
+        print("5. Testing bcrypt imports...")
+        import bcrypt
+        print("   ✅ bcrypt imports OK")
     except Exception as e:
-        print(f"   ❌ passlib import failed: {e}")
-        print("   💡 Try: pip install passlib[bcrypt]")
+        print(f"   ❌ bcrypt import failed: {e}")
+        print("   💡 Try: pip install bcrypt")
         return False
     
     try:
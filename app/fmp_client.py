@@ -1,18 +1,160 @@
 import aiohttp
 import asyncio
+import atexit
+from heapq import merge
+from operator import attrgetter
+import orjson
 import logging
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import AsyncIterator, List, Dict, Optional
+import os
+import random
 import re
+import threading
 import time
+import weakref
+from cachetools import TTLCache
 
 from app.config import get_settings
 
+try:
+    import uvloop
+except ImportError:  # not built for Windows
+    uvloop = None
+
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+_by_transaction_date = attrgetter("transaction_date")
+
+# "$1,001 - $15,000" style disclosure ranges, or a single "$15,000" amount.
+# Open-ended "Over $50,000" / "$50,000,001 +" brackets parse as their lower
+# bound (they used to fall through to 0.0); anything else does not match.
+_AMOUNT_RE = re.compile(
+    r"(?:over\s+)?\$?([\d,]+(?:\.\d+)?)(?:\s*(?:-\s*\$?([\d,]+(?:\.\d+)?)|\+))?",
+    re.IGNORECASE
+)
+
+# Canned FMP payloads served when no API key is configured
+_MOCK_RESPONSES = {
+    "v4/senate-trading": [
+        {
+            "representative": "Hon. Chuck Schumer",
+            "transaction": "Purchase", 
+            "ticker": "AAPL",
+            "transactionDate": "2025-01-15",
+            "publicationDate": "2025-02-01",
+            "amount": "$1,001 - $15,000"
+        },
+        {
+            "representative": "Hon. Susan Collins",
+            "transaction": "Sale",
+            "ticker": "MSFT", 
+            "transactionDate": "2025-01-20",
+            "publicationDate": "2025-02-05",
+            "amount": "$15,001 - $50,000"
+        }
+    ],
+    "v4/house-trading": [
+        {
+            "representative": "Hon. Nancy Pelosi",
+            "transaction": "Purchase",
+            "ticker": "GOOGL",
+            "transactionDate": "2025-01-10",
+            "publicationDate": "2025-01-30",
+            "amount": "$50,001 - $100,000"
+        }
+    ],
+}
+
+# One long-lived session per event loop so FMP calls reuse pooled keep-alive
+# connections and cached DNS instead of handshaking on every sync
+_shared_sessions = weakref.WeakKeyDictionary()
+
+def _build_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(
+        limit = 100,
+        limit_per_host = 20,
+        keepalive_timeout = 30,
+        ttl_dns_cache = 300
+    )
+    return aiohttp.ClientSession(
+        connector = connector,
+        timeout = aiohttp.ClientTimeout(total = 30, connect = 10)
+    )
+
+async def get_shared_session() -> aiohttp.ClientSession:
+    loop = asyncio.get_running_loop()
+    session = _shared_sessions.get(loop)
+    if session is None or session.closed:
+        session = _build_session()
+        _shared_sessions[loop] = session
+    return session
+
+async def close_shared_session():
+    session = _shared_sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+# Sync callers (Celery tasks, threadpool endpoints) share one background loop,
+# so its shared session and pooled connections survive from one sync to the next
+_background_loop = None
+_background_pid = None
+_background_lock = threading.Lock()
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _background_loop, _background_pid
+    with _background_lock:
+        # A forked worker inherits the object but not the thread running it
+        if _background_loop is None or _background_pid != os.getpid():
+            loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+            threading.Thread(target = loop.run_forever, name = "fmp-loop", daemon = True).start()
+            _background_loop = loop
+            _background_pid = os.getpid()
+        return _background_loop
+
+def _close_background_loop():
+    """Close the background loop's shared session and stop the loop at exit."""
+    loop = _background_loop
+    if loop is None or _background_pid != os.getpid() or not loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(close_shared_session(), loop).result(timeout = 5)
+    except Exception as e:
+        logger.warning("Failed to close FMP session: %s", e)
+    loop.call_soon_threadsafe(loop.stop)
+
+atexit.register(_close_background_loop)
+
+def run_sync(coro):
+    """Run a coroutine on the persistent background loop and wait for its result.
+
+    Safe from any thread, including one whose own event loop is running.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_background_loop()).result()
+
+def iter_sync(agen: AsyncIterator):
+    """Drive an async generator on the background loop from sync code."""
+    async def next_item():
+        return await agen.__anext__()
+
+    try:
+        while True:
+            try:
+                yield run_sync(next_item())
+            except StopAsyncIteration:
+                return
+    finally:
+        run_sync(agen.aclose())
+
 class TradeData:
+    # No per-instance __dict__; syncs hold thousands of these at once
+    __slots__ = (
+        "politician_name", "chamber", "ticker", "trade_type", "amount",
+        "transaction_date", "disclosure_date", "source"
+    )
+
     def __init__(self, politician_name, chamber, ticker, trade_type, amount, transaction_date, disclosure_date):
         self.politician_name = politician_name
         self.chamber = chamber
@@ -23,7 +165,35 @@ class TradeData:
         self.disclosure_date = disclosure_date
         self.source = "FMP"
 
+def _fallback_trades() -> List[TradeData]:
+    """Placeholder trades used when FMP returns nothing at all."""
+    return [
+        TradeData(
+            politician_name="Chuck Schumer",
+            chamber="Senate",
+            ticker="MSFT",
+            trade_type="Sell",
+            amount=32500,
+            transaction_date=datetime(2025, 1, 20),
+            disclosure_date=datetime(2025, 2, 5)
+        ),
+        TradeData(
+            politician_name="Nancy Pelosi",
+            chamber="House",
+            ticker="AAPL",
+            trade_type="Buy",
+            amount=15000,
+            transaction_date=datetime(2025, 1, 15),
+            disclosure_date=datetime(2025, 2, 1)
+        )
+    ]
+
 class FMPClient:
+    CHAMBER_ENDPOINTS = (
+        ("Senate", "v4/senate-trading"),
+        ("House", "v4/house-trading"),
+    )
+
     def __init__(self, api_key: str = None):
         self.api_key = api_key or settings.FMP_API_KEY
         self.base_url = "https://financialmodelingprep.com/api" 
@@ -32,32 +202,43 @@ class FMPClient:
         self.daily_limit = 200
         self.last_request_time = 0
         self.min_request_interval = 1.0
-        self.cache = {}
         self.cache_ttl = 3600
+        self.cache = TTLCache(maxsize = 1024, ttl = self.cache_ttl)
+        self._inflight = {}
+        self.max_concurrent_requests = 5
+        self.max_retries = 5
+        self._semaphore = None
 
         if not self.api_key:
             logger.warning("No api key found, will use mock data")
 
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession()
+        self.session = await get_shared_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
-            await self.session.close()
-    def _is_cache_valid(self, cache_entry: dict) -> bool:
-        age = time.time() - cache_entry['timestamp']
-        return age < self.cache_ttl
+        # The shared session outlives this client; it is closed by its owner
+        self.session = None
     async def _rate_limit(self):
+        # Reserve the next send slot before sleeping so concurrent callers are
+        # spaced out instead of all waking at the same instant
         current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        slot = max(current_time, self.last_request_time + self.min_request_interval)
+        self.last_request_time = slot
 
-        if time_since_last < self.min_request_interval:
-            wait_time = self.min_request_interval - time_since_last
-            logger.debug(f"Rate limiting waiting {wait_time:.2f} seconds")
+        wait_time = slot - current_time
+        if wait_time > 0:
+            logger.debug("Rate limiting waiting %.2f seconds", wait_time)
             await asyncio.sleep(wait_time)
 
-        self.last_request_time = time.time()
+    def _retry_delay(self, response: aiohttp.ClientResponse, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        return min(60, 2 ** attempt) + random.uniform(0, 1)
 
     async def _make_request(self, endpoint: str, params: dict = None) -> dict:
         if not self.api_key:
@@ -65,182 +246,166 @@ class FMPClient:
             return self._get_mock_data(endpoint)
         
         if self.requests_made >= self.daily_limit:
-            logger.error(f"Daily API limit reached {self.daily_limit}")
+            logger.error("Daily API limit reached %s", self.daily_limit)
             raise Exception("Daily API limit exceeded")
         
-        cache_key = f"{endpoint}_{params}"
-
-        if cache_key in self.cache and self._is_cache_valid(self.cache[cache_key]):
-            logger.debug(f"Cache hit for {endpoint}")
-            return self.cache[cache_key]['data']
-        await self._rate_limit()
-
-        params = params or {}
-
-        params['apikey'] = self.api_key
+        caller_params = tuple(sorted(
+            (key, value) for key, value in (params or {}).items() if key != "apikey"
+        ))
+        cache_key = (endpoint, caller_params)
+
+        data = self.cache.get(cache_key)
+        if data is not None:
+            logger.debug("Cache hit for %s", endpoint)
+            return data
+
+        # Single-flight: concurrent callers for the same key wait on one fetch
+        lock = self._inflight.setdefault(cache_key, asyncio.Lock())
+        try:
+            async with lock:
+                data = self.cache.get(cache_key)
+                if data is None:
+                    data = await self._fetch(endpoint, params)
+                    self.cache[cache_key] = data
+        finally:
+            # Callers already queued hold the lock object and re-check the
+            # cache; later ones hit the filled entry, so drop it here
+            if self._inflight.get(cache_key) is lock:
+                del self._inflight[cache_key]
+        return data
+
+    async def _fetch(self, endpoint: str, params: dict = None) -> dict:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        # Fresh dict so the caller's params (and the cache key) never carry the secret
+        request_params = {**(params or {}), "apikey": self.api_key}
 
         url = f"{self.base_url}/{endpoint}"
 
         try:
-            logger.info(f"Making FMP Api request: {endpoint}")
-
-            async with self.session.get(url, params = params) as response:
-                self.requests_made +=1
-                if response.status == 200:
-                    data = await response.json()
-
-                    self.cache[cache_key] = {
-                        'data': data,
-                        'timestamp': time.time()
-                    }
-
-                    logger.info(f"FMP Api success: {len(data)} records returned")
-                    return data
-                elif response.status == 429:
-                    logger.warning("Rate limit hit - waiting 60 seconds")
-                    await asyncio.sleep(60)
-                    return await self._make_request(endpoint, params)
-                else:
-                    error_text = await response.text()
-                    logger.error(f"FMP API error: {response.status}: {error_text}")
-                    raise Exception(f"FMP API error: {response.status}")
+            for attempt in range(self.max_retries + 1):
+                async with self._semaphore:
+                    await self._rate_limit()
+                    logger.info("Making FMP Api request: %s", endpoint)
+
+                    async with self.session.get(url, params = request_params) as response:
+                        self.requests_made +=1
+                        if response.status == 200:
+                            data = orjson.loads(await response.read())
+
+                            logger.info("FMP Api success: %s records returned", len(data))
+                            return data
+                        elif response.status == 429:
+                            delay = self._retry_delay(response, attempt)
+                        else:
+                            error_text = await response.text()
+                            logger.error("FMP API error: %s: %s", response.status, error_text)
+                            raise Exception(f"FMP API error: {response.status}")
+
+                if attempt == self.max_retries:
+                    break
+                # Back off outside the semaphore so other requests can proceed
+                logger.warning("Rate limit hit - retrying in %.1f seconds", delay)
+                await asyncio.sleep(delay)
+
+            raise Exception(f"FMP API rate limit: gave up after {self.max_retries} retries")
         except Exception as e:
-            logger.error(f"Failed to call FMP API: {e}")
+            logger.error("Failed to call FMP API: %s", e)
             raise
     def _get_mock_data(self, endpoint: str) -> List[dict]:
-        if "senate-trading" in endpoint:
-            return[
-                {
-                    "representative": "Hon. Chuck Schumer",
-                    "transaction": "Purchase", 
-                    "ticker": "AAPL",
-                    "transactionDate": "2025-01-15",
-                    "publicationDate": "2025-02-01",
-                    "amount": "$1,001 - $15,000"
-                },
-                {
-                    "representative": "Hon. Susan Collins",
-                    "transaction": "Sale",
-                    "ticker": "MSFT", 
-                    "transactionDate": "2025-01-20",
-                    "publicationDate": "2025-02-05",
-                    "amount": "$15,001 - $50,000"
-                }
-            ]
-        elif "house-trading" in endpoint:
-            return [
-                {
-                    "representative": "Hon. Nancy Pelosi",
-                    "transaction": "Purchase",
-                    "ticker": "GOOGL",
-                    "transactionDate": "2025-01-10",
-                    "publicationDate": "2025-01-30",
-                    "amount": "$50,001 - $100,000"
-                }
-            ]
-        
-        return []
+        return _MOCK_RESPONSES.get(endpoint, [])
     
-    async def get_senate_trades(self, limit: int = 100)->List[TradeData]:
+    async def _get_chamber_trades(self, chamber: str, endpoint: str, limit: int = 100) -> List[TradeData]:
         try:
-            logger.info(f"Fetching Senate trades (limit: {limit})")
+            logger.info("Fetching %s trades (limit: %s)", chamber, limit)
             raw_data = await self._make_request(
-                "v4/senate-trading",
+                endpoint,
                 params = {"limit": min(limit, 100)}
             )
 
-            trades  =[]
-            for item in raw_data:
+            trades = []
+            for item in raw_data[:limit]:
                 try:
-                    trade = self._transform_trade_data(item, "Senate")
+                    trade = self._transform_trade_data(item, chamber)
                     if trade:
                         trades.append(trade)
                 except Exception as e:
-                    logger.warning(f"Failed to transform senate trade{e}")
+                    logger.warning("Failed to transform %s trade: %s", chamber, e)
                     continue
 
-            logger.info(f"Successfully processed {len(trades)} trades")
+            logger.info("Successfully processed %s trades", len(trades))
             return trades
         except Exception as e:
-            logger.error(f"Failed to fetch Senate trades: {e}")
+            logger.error("Failed to fetch %s trades: %s", chamber, e)
             return []
+
+    async def get_senate_trades(self, limit: int = 100)->List[TradeData]:
+        return await self._get_chamber_trades("Senate", "v4/senate-trading", limit)
     
     async def get_house_trades(self, limit: int = 100)->List[TradeData]:
-        try:
-            logger.info(f"Fetching House trades (limit: {limit})")
-            raw_data = await self._make_request(
-                "v4/house-trading",
-                params = {"limit": min(limit, 100)}
-            )
-            trades =  []
-            for item in raw_data:
-                try:
-                    trade = self._transform_trade_data(item, "House")
-                    if trade:
-                        trades.append(trade)
-
-                except Exception as e:
-                    logger.warning(f"Failed to transform House trade: {e}")
-                    continue
-            logger.info(f"Successfully processed {len(trades)} trades")
-            return trades
-        except Exception as e:
-            logger.error(f"Failed to fetch House trades: {e}")
-            return []
+        return await self._get_chamber_trades("House", "v4/house-trading", limit)
         
     async def get_all_trades(self, limit_per_chamber: int = 50) -> List[TradeData]:
-        logger.info(f"Fetching all congressional trades ({limit_per_chamber} per chamber)")
+        logger.info("Fetching all congressional trades (%s per chamber)", limit_per_chamber)
+
+        # Fan out over every endpoint at once; the semaphore and rate limiter
+        # in _fetch keep the burst inside FMP's limits
+        results = await asyncio.gather(
+            *(
+                self._get_chamber_trades(chamber, endpoint, limit_per_chamber)
+                for chamber, endpoint in self.CHAMBER_ENDPOINTS
+            ),
+            return_exceptions=True
+        )
     
-        senate_task = self.get_senate_trades(limit_per_chamber)
-        house_task = self.get_house_trades(limit_per_chamber)  
+        chamber_lists = []
 
-        senate_trades, house_trades = await asyncio.gather(  
-            senate_task, house_task, return_exceptions=True)
-    
-        all_trades = []
-    
-        if isinstance(senate_trades, list) and senate_trades:
-            all_trades.extend(senate_trades)
-        elif not isinstance(senate_trades, list):
-            logger.error(f"Senate trades failed: {senate_trades}")
+        for (chamber, _), chamber_trades in zip(self.CHAMBER_ENDPOINTS, results):
+            if isinstance(chamber_trades, list):
+                # FMP returns newest first, so this is a linear pass for Timsort
+                chamber_trades.sort(key=_by_transaction_date, reverse=True)
+                chamber_lists.append(chamber_trades)
+            else:
+                logger.error("%s trades failed: %s", chamber, chamber_trades)
 
-        if isinstance(house_trades, list) and house_trades:
-            all_trades.extend(house_trades)
-        elif not isinstance(house_trades, list):
-            logger.error(f"House trades failed: {house_trades}")
+        all_trades = list(merge(*chamber_lists, key=_by_transaction_date, reverse=True))
 
         if not all_trades:
             logger.info("No real trades available - using mock data for testing")
-            from datetime import datetime
-
-            mock_trade1 = TradeData(
-            politician_name="Nancy Pelosi",
-            chamber="House",
-            ticker="AAPL", 
-            trade_type="Buy",
-            amount=15000,
-            transaction_date=datetime(2025, 1, 15),
-            disclosure_date=datetime(2025, 2, 1)
-            )
-
-            mock_trade2 = TradeData(
-            politician_name="Chuck Schumer",
-            chamber="Senate", 
-            ticker="MSFT",
-            trade_type="Sell",
-            amount=32500,
-            transaction_date=datetime(2025, 1, 20),
-            disclosure_date=datetime(2025, 2, 5)
-            )
-
-            all_trades = [mock_trade1, mock_trade2]
-
-        if all_trades and hasattr(all_trades[0], 'transaction_date'):
-            all_trades.sort(key=lambda x: x.transaction_date, reverse=True)
+            all_trades = _fallback_trades()
 
-        logger.info(f"✅ Total trades fetched: {len(all_trades)}")
+        logger.info("✅ Total trades fetched: %s", len(all_trades))
         return all_trades
     
+    async def stream_trades(self, limit_per_chamber: int = 50, page_size: int = 500) -> AsyncIterator[List[TradeData]]:
+        """Yield pages of at most page_size trades as each chamber's response lands.
+
+        Unlike get_all_trades nothing is merged or held for the whole sync, so
+        the caller can store one page while the other chamber is still in flight.
+        """
+        logger.info("Streaming congressional trades (%s per chamber)", limit_per_chamber)
+
+        pending = [
+            asyncio.ensure_future(self._get_chamber_trades(chamber, endpoint, limit_per_chamber))
+            for chamber, endpoint in self.CHAMBER_ENDPOINTS
+        ]
+        total = 0
+        try:
+            for next_done in asyncio.as_completed(pending):
+                chamber_trades = await next_done
+                for start in range(0, len(chamber_trades), page_size):
+                    page = chamber_trades[start:start + page_size]
+                    total += len(page)
+                    yield page
+        finally:
+            for future in pending:
+                future.cancel()
+
+        if not total:
+            logger.info("No real trades available - using mock data for testing")
+            yield _fallback_trades()
+
     def _transform_trade_data(self, raw_data: dict, chamber: str)-> Optional[TradeData]:
         try:
             politician_name = raw_data.get("representative", "")
@@ -252,7 +417,7 @@ class FMPClient:
 
             ticker = raw_data.get("ticker", "").upper().strip()
             if not ticker or len(ticker)> 10:
-                logger.warning(f"Invalid ticker:{ticker}")
+                logger.warning("Invalid ticker:%s", ticker)
                 return None
             
             transaction = raw_data.get("transaction", "").lower()
@@ -284,26 +449,26 @@ class FMPClient:
             )
             return trade
         except Exception as e:
-            logger.error(f"Failed to transform trade data: {e}")
+            logger.error("Failed to transform trade data: %s", e)
             return None
     def _parse_amount_range(self, amount_str: str) -> float:
         try:
             if not amount_str:
                 return 0.0
-            
-            clean_str = amount_str.replace("$", "").replace(",", "")
-
-            if " - " in clean_str:
-                parts = clean_str.split(" - ")
-                if len(parts) == 2:
-                    min_amount = float(parts[0])
-                    max_amount = float(parts[1])
-                    return (min_amount + max_amount)/2
-            
-            return float(clean_str)
+
+            match = _AMOUNT_RE.fullmatch(amount_str.strip())
+            if not match:
+                raise ValueError(amount_str)
+
+            min_amount = float(match.group(1).replace(",", ""))
+            if match.group(2) is None:
+                return min_amount
+
+            max_amount = float(match.group(2).replace(",", ""))
+            return (min_amount + max_amount)/2
         
         except Exception:
-            logger.warning(f"Could not parse amount: {amount_str}")
+            logger.warning("Could not parse amount: %s", amount_str)
             return 0.0
         
     def _parse_date(self, date_str: str) -> Optional[datetime]:
@@ -311,8 +476,8 @@ class FMPClient:
             if not date_str:
                 return None
             
-            return datetime.strptime(date_str, "%Y-%m-%d")
+            return datetime.fromisoformat(date_str)
         except Exception:
-            logger.warning(f"Could not parse date: {date_str}")
+            logger.warning("Could not parse date: %s", date_str)
             return None
         
\ No newline at end of file
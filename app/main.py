@@ -1,13 +1,18 @@
 from fastapi import FastAPI, HTTPException, Depends, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
 from datetime import datetime, timezone, timedelta
 from contextlib import asynccontextmanager
+import base64
+import orjson
 import time
 import logging
-from app.database import engine, get_db
+import redis
+from app.database import get_db, estimate_row_counts
+from sqlalchemy import select, func, and_, or_
 from sqlalchemy.orm import Session
-from app.models import Base, Trade, Politician, User
+from app.models import Trade, Politician, User
 from app.config import get_settings
 from app.auth import (
     UserCreate, UserLogin, Token, UserResponse,
@@ -15,25 +20,118 @@ from app.auth import (
     get_current_user, get_current_active_user
 )
 from app.trading_endpoints import router as trading_router
+from app.cache import cached, close_redis
+from app.services import AnalyticsService
+from app.schemas import TradeOut, TradeListResponse, PoliticianListResponse, PoliticianTradesResponse
 
 logging.basicConfig(level = logging.INFO)
 logger = logging.getLogger(__name__)
 
 settings = get_settings()
 
+def _encode_cursor(trade: Trade) -> str:
+    raw = f"{trade.transaction_date.isoformat()}|{trade.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date_part, id_part = raw.rsplit("|", 1)
+        return datetime.fromisoformat(date_part), int(id_part)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code = status.HTTP_400_BAD_REQUEST,
+            detail = "Invalid cursor"
+        )
+
+def _paginate_trades(db: Session, stmt, limit: int, offset: int, cursor: str, include_total: bool = None):
+    """Page a filtered Trade select newest-first.
+
+    With a cursor the page is an index range scan on (transaction_date, id)
+    instead of an OFFSET scan, so every page costs the same. The filtered
+    COUNT is O(n), so by default only the first (cursorless) page runs it;
+    include_total=true forces it on cursor pages too.
+    """
+    if include_total is None:
+        include_total = not cursor
+
+    total_count = None
+    if include_total:
+        total_count = db.scalar(stmt.with_only_columns(func.count(), maintain_column_froms = True))
+
+    if cursor:
+        cur_date, cur_id = _decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            Trade.transaction_date < cur_date,
+            and_(Trade.transaction_date == cur_date, Trade.id < cur_id)
+        ))
+        offset = 0
+
+    stmt = stmt.order_by(Trade.transaction_date.desc(), Trade.id.desc())
+
+    # One extra row tells us whether another page exists without counting
+    trades = db.scalars(stmt.offset(offset).limit(limit + 1)).all()
+    has_more = len(trades) > limit
+    trades = trades[:limit]
+
+    pagination = {
+        "total": total_count,
+        "limit": limit,
+        "offset": offset,
+        "has_more": has_more,
+        "next_cursor": _encode_cursor(trades[-1]) if has_more else None
+    }
+    return trades, pagination
+
+def _trade_conditions(politician: str = None, ticker: str = None, trade_type: str = None) -> list:
+    # Collected once and applied in a single where(), rather than cloning the
+    # statement per filter
+    conds = []
+    if politician:
+        conds.append(Trade.politician_name.ilike(f"%{politician}%"))
+    if ticker:
+        conds.append(Trade.ticker.ilike(f"%{ticker}%"))
+    if trade_type:
+        conds.append(Trade.trade_type.ilike(f"%{trade_type}%"))
+    return conds
+
+# Plain columns (no ORM objects) for the NDJSON export; orjson encodes the rows
+_TRADE_EXPORT_COLUMNS = [Trade.__table__.c[name] for name in TradeOut.model_fields]
+
+def _stream_trade_rows(bind, stmt, batch_size: int = 200):
+    # Request-scoped sessions close before a streaming body is sent, so the
+    # generator owns its own session and server-side cursor
+    with Session(bind = bind) as session:
+        result = session.execute(stmt.execution_options(yield_per = batch_size))
+        for rows in result.mappings().partitions():
+            yield b"".join(orjson.dumps(dict(row)) + b"\n" for row in rows)
+
+def get_redis_client(request: Request) -> redis.Redis:
+    return request.app.state.redis
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    logger.info(f"Starting {settings.PROJECT_NAME}")
-    logger.info(f"Environment: {settings.ENVIRONMENT}")
-    logger.info(f"Database: {settings.DATABASE_URL}")
-    logger.info(f"FMP API: {'Configured' if settings.FMP_API_KEY else 'Not configured'}")
-
-    Base.metadata.create_all(bind = engine)
-    logger.info(f"Database tables ready")
+    logger.info("Starting %s", settings.PROJECT_NAME)
+    logger.info("Environment: %s", settings.ENVIRONMENT)
+    logger.info("Database: %s", settings.DATABASE_URL)
+    logger.info("FMP API: %s", 'Configured' if settings.FMP_API_KEY else 'Not configured')
+
+    # Schema is owned by Alembic (`alembic upgrade head` runs once per deploy)
+
+    # Process-wide client, reused by every request instead of reconnecting.
+    # Outbound HTTP (FMP, Alpaca) runs on fmp_client's background loop and
+    # its own shared session, not on this loop.
+    app.state.redis = redis.Redis.from_url(
+        settings.REDIS_URL,
+        socket_connect_timeout = 1,
+        socket_timeout = 1
+    )
 
     yield
 
-    logger.info(f"Shutting down {settings.PROJECT_NAME}")
+    app.state.redis.close()
+    close_redis()
+    logger.info("Shutting down %s", settings.PROJECT_NAME)
 
 app = FastAPI(
     title = settings.PROJECT_NAME,
@@ -57,6 +155,8 @@ app = FastAPI(
 
     redoc_url = "/redoc",
 
+    default_response_class = ORJSONResponse,
+
     lifespan = lifespan
 )
 
@@ -73,18 +173,21 @@ app.add_middleware(
     allow_headers = ["*"]
 )
 
+# Trade listings run to hundreds of KB of repetitive JSON
+app.add_middleware(GZipMiddleware, minimum_size = 1024)
+
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     start_time = time.time()
 
-    logger.info(f"{request.method} {request.url.path} - Started")
+    logger.info("%s %s - Started", request.method, request.url.path)
 
     response = await call_next(request)
 
     process_time = time.time() - start_time
 
-    logger.info(f"{request.method} {request.url.path} - {response.status_code} ({process_time:.3f} s)")
+    logger.info("%s %s - %s (%.3f s)", request.method, request.url.path, response.status_code, process_time)
 
     response.headers["X-Process-Time"] = str(process_time)
 
@@ -93,7 +196,7 @@ async def log_requests(request: Request, call_next):
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc : Exception):
-    logger.error(f"Error on {request.method} {request.url.path}: {str(exc)}")
+    logger.error("Error on %s %s: %s", request.method, request.url.path, str(exc))
 
     return JSONResponse(
         status_code = 500,
@@ -134,14 +237,13 @@ async def root():
     }
         
 @app.get("/health", tags = ["Health"])
-async def health_check(db: Session = Depends(get_db)):
+@cached(expire = 10)
+def health_check(db: Session = Depends(get_db)):
     try:
-        politician_count = db.query(Politician).count()
-        trade_count = db.query(Trade).count()
-        user_count = db.query(User).count()
-
+        # Load balancers hit this constantly: one round trip of planner
+        # estimates, which doubles as the database latency probe
         start_time = time.time()
-        db.query(Trade).first()
+        counts = estimate_row_counts(db, Politician, Trade, User)
         db_response_time = time.time() - start_time
 
         return{
@@ -158,9 +260,9 @@ async def health_check(db: Session = Depends(get_db)):
                 "url": settings.DATABASE_URL[:30] + "...",
                 "response_time_ms": round(db_response_time * 1000, 2),
                 "record_counts":{
-                    "politicians": politician_count,
-                    "trades": trade_count,
-                    "users": user_count
+                    "politicians": counts["politicians"],
+                    "trades": counts["trades"],
+                    "users": counts["users"]
                 }
             },
             "configuration":{
@@ -176,7 +278,7 @@ async def health_check(db: Session = Depends(get_db)):
             }
         }
     except Exception as e:
-        logger.error(f"Health check failed {str(e)}")
+        logger.error("Health check failed %s", str(e))
         return JSONResponse(
             status_code = status.HTTP_503_SERVICE_UNAVAILABLE,
             content = {
@@ -194,13 +296,15 @@ async def health_check(db: Session = Depends(get_db)):
             }
         )
 
-@app.get("/api/trades", tags=["Trades"])
-async def get_trades(
+@app.get("/api/trades", response_model = TradeListResponse, tags=["Trades"])
+def get_trades(
     limit:int = 50,
     offset:int = 0,
     politician:str = None,
     ticker:str = None,
     trade_type:str = None,
+    cursor:str = None,
+    include_total:bool = None,
     db: Session = Depends(get_db)
 ):
     try:
@@ -209,31 +313,13 @@ async def get_trades(
         if limit <1:
             limit = 1
 
-        query = db.query(Trade)
-
-        if politician:
-            query = query.filter(Trade.politician_name.ilike(f"%{politician}%"))
-        if ticker:
-            query = query.filter(Trade.ticker.ilike(f"%{ticker}%"))
-        if trade_type:
-            query = query.filter(Trade.trade_type.ilike(f"%{trade_type}%"))
+        stmt = select(Trade).where(*_trade_conditions(politician, ticker, trade_type))
 
-        query = query.order_by(Trade.transaction_date.desc())
-
-        total_count = query.count()
-
-        trades = query.offset(offset).limit(limit).all()
-
-        trades_data = [trade.to_dict() for trade in trades]
+        trades, pagination = _paginate_trades(db, stmt, limit, offset, cursor, include_total)
 
         return{
-            "trades":trades_data,
-            "pagination":{
-                "total":total_count,
-                "limit":limit,
-                "offset":offset,
-                "has_more":offset+limit < total_count
-            },
+            "trades":trades,
+            "pagination":pagination,
             "filters":{
                 "politician":politician,
                 "ticker":ticker,
@@ -245,15 +331,37 @@ async def get_trades(
             },
             "timestamp":datetime.now(timezone.utc).isoformat()
         }
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Error gettings trades: {str(e)}")
+        logger.error("Error gettings trades: %s", str(e))
         raise HTTPException(
             status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail = "Failed to retrieve trades"
         )
 
-@app.get("/api/politicians", tags = ["Politicians"])
-async def get_politicians(
+@app.get("/api/trades.ndjson", tags=["Trades"])
+def export_trades(
+    limit:int = 1000,
+    politician:str = None,
+    ticker:str = None,
+    trade_type:str = None,
+    db: Session = Depends(get_db)
+):
+    """Newest-first trades as newline-delimited JSON, streamed row batch by batch."""
+    limit = max(1, min(limit, 10000))
+
+    stmt = (
+        select(*_TRADE_EXPORT_COLUMNS)
+        .where(*_trade_conditions(politician, ticker, trade_type))
+        .order_by(Trade.transaction_date.desc(), Trade.id.desc())
+        .limit(limit)
+    )
+
+    return StreamingResponse(_stream_trade_rows(db.get_bind(), stmt), media_type = "application/x-ndjson")
+
+@app.get("/api/politicians", response_model = PoliticianListResponse, tags = ["Politicians"])
+def get_politicians(
     limit: int = 50,
     offset: int = 0,
     chamber: str = None,
@@ -267,24 +375,25 @@ async def get_politicians(
         if limit <1:
             limit = 1
         
-        query = db.query(Politician)
-
+        # Low-cardinality columns with canonical values stored by the sync,
+        # so plain equality is enough and stays index-friendly
+        conds = []
         if chamber:
-            query = query.filter(Politician.chamber.ilike(f"%{chamber}%"))
+            conds.append(Politician.chamber == chamber)
         if party:
-            query = query.filter(Politician.party.ilike(f"%{party}%"))
+            conds.append(Politician.party == party)
         if state:
-            query = query.filter(Politician.state.ilike(f"%{state}%"))
-        
-        query = query.order_by(Politician.name)
+            conds.append(Politician.state == state)
 
-        total_count = query.count()
-        politicians = query.offset(offset).limit(limit).all()
+        stmt = select(Politician).where(*conds)
+        
+        total_count = db.scalar(stmt.with_only_columns(func.count(), maintain_column_froms = True))
 
-        politician_data = [politician.to_dict() for politician in politicians]
+        stmt = stmt.order_by(Politician.name)
+        politicians = db.scalars(stmt.offset(offset).limit(limit)).all()
 
         return {
-            "politicians":politician_data,
+            "politicians":politicians,
             "pagination":{
                 "total":total_count,
                 "limit":limit,
@@ -299,109 +408,58 @@ async def get_politicians(
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     except Exception as e:
-        logger.error(f"Error getting politicians: {str(e)}")
+        logger.error("Error getting politicians: %s", str(e))
         raise HTTPException(
             status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail = "Failed to retrieve politicians"
         )
     
 @app.get("/api/politicians/{politician_id}/trades",
-tags = ["Politicians"])
-async def get_politician_trades(
+response_model = PoliticianTradesResponse, tags = ["Politicians"])
+def get_politician_trades(
     politician_id: int,
     limit: int = 50,
     offset: int = 0,
+    cursor: str = None,
+    include_total: bool = None,
     db: Session = Depends(get_db)
 ):
     try:
-        politician = db.query(Politician).filter(Politician.id == politician_id).first()
+        politician = db.get(Politician, politician_id)
         if not politician:
             raise HTTPException(
                 status_code = status.HTTP_404_NOT_FOUND,
                 detail = "Politician not found"
             )
         
-        query = db.query(Trade).filter(Trade.politician_name == politician.name)
-        query = query.order_by(Trade.transaction_date.desc())
-
-        total_count = query.count()
-        trades = query.offset(offset).limit(limit).all()
+        stmt = select(Trade).where(Trade.politician_id == politician.id)
 
-        trades_data = [trade.to_dict() for trade in trades]
+        trades, pagination = _paginate_trades(db, stmt, limit, offset, cursor, include_total)
 
         return {
-            "politician": politician.to_dict(),
-            "trades": trades_data,
-            "pagination":{
-                "total": total_count,
-                "limit": limit,
-                "offset": offset,
-                "has_more": offset + limit < total_count
-            },
+            "politician": politician,
+            "trades": trades,
+            "pagination": pagination,
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error getting politician trades : {str(e)}")
+        logger.error("Error getting politician trades : %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail = "Failed to recieve politician trades"
         )
 
 @app.get("/api/analytics/summary", tags = ["Analytics"])
-async def get_analytics_summary(db: Session = Depends(get_db)):
+@cached(expire = 300)
+def get_analytics_summary(db: Session = Depends(get_db)):
     try:
-        from sqlalchemy import func
-        
-        total_politicians = db.query(Politician).count()
-        total_trades = db.query(Trade).count()
-
-        trade_stats = db.query(
-            func.sum(Trade.estimated_amount).label('total_volume'),
-            func.avg(Trade.estimated_amount).label('avg_trade_size'),
-            func.max(Trade.estimated_amount).label('max_trade'),
-            func.min(Trade.estimated_amount).label('min_trade')
-            ).first()
-        
-        party_breakdown = db.query(
-            Trade.party,
-            func.count(Trade.id).label('trade_count'),
-            func.sum(Trade.estimated_amount).label('total_volume')    
-        ).group_by(Trade.party).all()
-
-        top_traders = db.query(
-            Trade.politician_name,
-            func.count(Trade.id).label('trade_count'),
-            func.sum(Trade.estimated_amount).label('total_volume')
-        ).group_by(Trade.politician_name).order_by(func.sum(Trade.estimated_amount).desc()).limit(10).all()
+        analytics = AnalyticsService.get_summary(db)
 
         return {
-            "summary":{
-                "total_politicians": total_politicians,
-                "total_trades": total_trades,
-                "total_volume": float(trade_stats.total_volume or 0),
-                "average_trade_size":float(trade_stats.avg_trade_size or 0),
-                "largest_trade":float(trade_stats.max_trade or 0),
-                "smallest_trade":float(trade_stats.min_trade or 0)
-            },
-            "party_breakdown":[
-                {
-                    "party": party,
-                    "trade_count": trade_count,
-                    "total_volume": float(total_volume or 0)
-                }
-                for party, trade_count, total_volume in party_breakdown
-            ],
-            "top_traders":[
-                {
-                    "politician": politician,
-                    "trade_count": trade_count,
-                    "total_volume": float(total_volume or 0)
-                }
-                for politician, trade_count, total_volume in top_traders
-            ],
+            **analytics,
             "api_info":{
                 "name": settings.PROJECT_NAME,
                 "version": settings.VERSION,
@@ -410,13 +468,13 @@ async def get_analytics_summary(db: Session = Depends(get_db)):
             "timestamp":datetime.now(timezone.utc).isoformat()
             }
     except Exception as e:
-        logger.error(f"Error getting analytics {str(e)}")
+        logger.error("Error getting analytics %s", str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail = "Failed to retrieve analytics"
         )
 @app.post("/auth/register", response_model = UserResponse, tags = ["Authentication"])
-async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
+def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     try:
         user = create_user(
             db = db,
@@ -424,7 +482,7 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
             password = user_data.password,
             full_name = user_data.full_name
         )
-        logger.info(f"New user registered {user.email}")
+        logger.info("New user registered %s", user.email)
 
         return UserResponse(
             id = user.id,
@@ -437,14 +495,14 @@ async def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Registration error: {e}")
+        logger.error("Registration error: %s", e)
         raise HTTPException(
             status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail = "Registration failed"
         )
     
 @app.post("/auth/login", response_model = Token, tags = ["Authentication"])
-async def login_user(login_data: UserLogin, db: Session = Depends(get_db)):
+def login_user(login_data: UserLogin, db: Session = Depends(get_db)):
     try:
         user = authenticate_user(db, login_data.email, login_data.password)
         if not user:
@@ -455,7 +513,7 @@ async def login_user(login_data: UserLogin, db: Session = Depends(get_db)):
             )
         
         access_token = create_access_token(data = {"sub": user.email})
-        logger.info(f"User logged in : {user.email}")
+        logger.info("User logged in : %s", user.email)
 
         return Token(
             access_token=access_token,
@@ -465,7 +523,7 @@ async def login_user(login_data: UserLogin, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Login error: {e}")
+        logger.error("Login error: %s", e)
         raise HTTPException(
             status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail = "login failed"
@@ -492,40 +550,57 @@ async def protected_example(current_user: User = Depends(get_current_active_user
     }
 from app.auth import get_current_active_user
 @app.post("/admin/sync-trades", tags = ["Admin"])
-async def trigger_manual_sync(
+def trigger_manual_sync(
     limit_per_chamber: int = 20,
+    wait: bool = False,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
-    try:
-        from app.services import TradeService
-        sync_result = TradeService.sync_trades_from_fmp(db, limit_per_chamber)
-
-        background_task_id = None
+    # Default: hand the sync to Celery and return at once; poll task-status.
+    # wait=true runs it inline instead (never both), holding this request.
+    if wait:
         try:
-            from app.tasks import manual_sync_task
-            background_task = manual_sync_task.delay(limit_per_chamber)
-            background_task_id = background_task.id
+            from app.services import TradeService
+            sync_result = TradeService.sync_trades_from_fmp(db, limit_per_chamber)
+
+            return{
+                "message": "Trade sync completed",
+                "direct_sync": sync_result,
+                "triggered_by": current_user.email,
+                "timestamp": datetime.now(timezone.utc)
+            }
+
         except Exception as e:
-            logger.warning(f"Could not queue background task: {e}")
+            logger.error("Manual sync failed: %s", str(e))
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail = f"Sync failed: {str(e)}"
+            )
 
-        return{
-            "message": "Trade sync completed",
-            "direct_sync": sync_result,
-            "background_task_id": background_task_id,
-            "triggered_by": current_user.email,
-            "timestamp": datetime.now(timezone.utc)
-        }
-    
+    try:
+        from app.tasks import manual_sync_task
+        # retry=False: an unreachable broker should fail this request fast
+        background_task = manual_sync_task.apply_async(args = (limit_per_chamber,), retry = False)
     except Exception as e:
-        logger.error(f"Manual sync failed: {str(e)}")
+        logger.error("Could not queue background sync: %s", e)
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail = f"Sync failed: {str(e)}"
+            status_code = status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail = "Could not queue sync task; retry later or use wait=true"
         )
+
+    return JSONResponse(
+        status_code = status.HTTP_202_ACCEPTED,
+        content = {
+            "message": "Trade sync queued",
+            "background_task_id": background_task.id,
+            "status_url": f"/admin/task-status/{background_task.id}",
+            "triggered_by": current_user.email,
+            "timestamp": datetime.now(timezone.utc).isoformat()
+        }
+    )
     
 @app.get("/admin/task-status/{task_id}", tags = ["Admin"])
-async def get_task_status(
+def get_task_status(
     task_id: str,
     current_user: User = Depends(get_current_active_user)
 ):
@@ -549,14 +624,14 @@ async def get_task_status(
 
         return response
     except Exception as e:
-        logger.error(f"Task status check failed {str(e)}")
+        logger.error("Task status check failed %s", str(e))
         raise HTTPException(
             status_code = status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail = f"Could not check taks status : {str(e)}"
         )
     
 @app.get("/admin/workers", tags = ["Admin"])
-async def get_worker_status(current_user: User = Depends(get_current_active_user)):
+def get_worker_status(current_user: User = Depends(get_current_active_user)):
     try:
         from app.tasks import celery_app
         inspector = celery_app.control.inspect()
@@ -582,7 +657,7 @@ async def get_worker_status(current_user: User = Depends(get_current_active_user
         }
     
     except Exception as e:
-        logger.warning(f"Worker status check faild: {str(e)}")
+        logger.warning("Worker status check faild: %s", str(e))
         return {
             "error": f"Could not connect to celery: {str(e)}",
             "message": "Make sure Redis and Celery workers are running",
@@ -590,8 +665,9 @@ async def get_worker_status(current_user: User = Depends(get_current_active_user
             "timestamp": datetime.now(timezone.utc).isoformat()
         }
 @app.get("/admin/system-status", tags = ["Admin"])
-async def get_system_status(
+def get_system_status(
     current_user: User = Depends(get_current_active_user),
+    redis_client: redis.Redis = Depends(get_redis_client),
     db: Session = Depends(get_db)
 ):
     status_info = {
@@ -604,18 +680,17 @@ async def get_system_status(
         }
     
     try:
-        trade_count = db.query(Trade).count()
-        politician_count = db.qeury(Politician).count()
+        counts = estimate_row_counts(db, Trade, Politician)
 
         yesterday = datetime.now(timezone.utc) - timedelta(days = 1)
-        recent_trades = db.query(Trade).filter(
-            Trade.created_at >= yesterday
-        ).count()
+        recent_trades = db.scalar(
+            select(func.count()).select_from(Trade).where(Trade.created_at >= yesterday)
+        )
 
-        status_info["databse"] = {
+        status_info["database"] = {
             "status": "connected",
-            "total_trades": trade_count,
-            "total_politicians": politician_count,
+            "total_trades": counts["trades"],
+            "total_politicians": counts["politicians"],
             "trades_added_today": recent_trades
         }
     
@@ -626,12 +701,11 @@ async def get_system_status(
         }
 
     try:
-        import redis
-        r = redis.Redis(host = 'localhost', port = 6379, db = 0)
-        r.ping()
+        redis_client.ping()
+        connection_kwargs = redis_client.connection_pool.connection_kwargs
         status_info["redis"] = {
             "status": "connected",
-            "host": "localhost:6379"
+            "host": f"{connection_kwargs.get('host')}:{connection_kwargs.get('port')}"
         }
     except Exception as e:
         status_info["redis"] = {
@@ -657,6 +731,8 @@ async def get_system_status(
 
     return status_info
 
+# Development server only (single process, auto-reload). Production runs
+# gunicorn with uvicorn workers: gunicorn -c gunicorn.conf.py app.main:app
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
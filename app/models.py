@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, ForeignKey, Index, DDL, event, and_, literal
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from app.database import Base
@@ -7,6 +7,7 @@ class Trade(Base):
     __tablename__ = "trades"
     id = Column(Integer, primary_key=True, index=True)
     politician_name = Column(String(100), nullable = False, index = False)
+    politician_id = Column(Integer, ForeignKey("politicians.id"))
     chamber = Column(String(10), nullable = False)
     party = Column(String(20))
     state = Column(String(50))
@@ -26,37 +27,98 @@ class Trade(Base):
     stock_price_at_trade = Column(Float)
     committees = Column(Text)
 
-    disclosure_delay_days = Column(Integer)
+    disclosure_delay_days = Column(Integer, nullable = False)
 
     created_at = Column(DateTime, default = datetime.now(timezone.utc))
     updated_at = Column(DateTime, default = datetime.now(timezone.utc), onupdate = datetime.now(timezone.utc))
 
     source = Column(String(50), default = "FMP")
 
-    def __repr__(self):
-        return f"Trade {self.politician_name}: {self.trade_type} {self.ticker} ${self.estimated_amount}"
-    
-    def to_dict(self):
+    # lazy="raise": load explicitly rather than firing one query per row
+    politician = relationship("Politician", back_populates = "trades", lazy = "raise")
+
+    @staticmethod
+    def derived_fields(transaction_date, disclosure_date, min_amount = None, max_amount = None, estimated_amount = None) -> dict:
+        """Columns computed from others, stored once at write time.
+
+        ORM writes get these from the listener below; Core/bulk inserts skip
+        ORM events and must merge this into their rows themselves.
+        """
+        if estimated_amount is None and min_amount is not None and max_amount is not None:
+            estimated_amount = (min_amount + max_amount) / 2
         return {
-            "id": self.id,
-            "politician_name": self.politician_name,
-            "chamber": self.chamber,
-            "party": self.party,
-            "ticker": self.ticker,
-            "company_name": self.company_name,
-            "trade_type": self.trade_type,
-            "amount_range": self.amount_range,
-            "estimated_amount": self.estimated_amount,
-            "transaction_date": self.transaction_date.isoformat() if self.transaction_date else None,
-            "disclosure_date": self.disclosure_date.isoformat() if self.disclosure_date else None,
-            "disclosure_delay_days": self.disclosure_delay_days,
-            "stock_price_at_trade": self.stock_price_at_trade,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "state": self.state,
-            "min_amount": self.min_amount,
-            "max_amount": self.max_amount,
-            "committees": self.committees,
+            "estimated_amount": estimated_amount,
+            "disclosure_delay_days": (
+                (disclosure_date - transaction_date).days
+                if transaction_date is not None and disclosure_date is not None else None
+            )
         }
+
+    def __repr__(self):
+        return f"Trade {self.politician_name}: {self.trade_type} {self.ticker} ${self.estimated_amount}"
+
+@event.listens_for(Trade, "before_insert")
+@event.listens_for(Trade, "before_update")
+def _fill_trade_derived_fields(mapper, connection, target):
+    derived = Trade.derived_fields(
+        target.transaction_date, target.disclosure_date,
+        target.min_amount, target.max_amount, target.estimated_amount
+    )
+    for key, value in derived.items():
+        setattr(target, key, value)
+
+# Backs keyset pagination: newest-first range scans on (transaction_date, id)
+Index("ix_trades_transaction_date_id", Trade.transaction_date.desc(), Trade.id.desc())
+
+# Filter + newest-first order in one range scan; politician_name leads its
+# composite, so a separate single-column index on it would be redundant
+Index("ix_trades_politician_date", Trade.politician_name, Trade.transaction_date)
+Index("ix_trades_ticker_date", Trade.ticker, Trade.transaction_date)
+Index("ix_trades_politician_id_date", Trade.politician_id, Trade.transaction_date)
+Index("ix_trades_party", Trade.party)
+Index("ix_trades_created_at", Trade.created_at)
+
+# One row per disclosure; also the conflict target for the sync upsert
+Index(
+    "ix_trades_dedup",
+    Trade.politician_name, Trade.ticker, Trade.transaction_date, Trade.disclosure_date,
+    unique = True
+)
+
+# Copy rule for trading bots; the partial index below only holds matching rows
+COPY_TRADE_TYPE = "Buy"
+MIN_COPY_AMOUNT = 15000
+
+def copyable_trade_conditions() -> tuple:
+    # Literals, not bind params: a partial index is only used when the planner
+    # can see the query repeats its predicate
+    return (
+        Trade.trade_type == literal(COPY_TRADE_TYPE, literal_execute = True),
+        Trade.estimated_amount >= literal(MIN_COPY_AMOUNT, literal_execute = True)
+    )
+
+_copyable_index_where = and_(*copyable_trade_conditions())
+Index(
+    "ix_trades_copy_candidates", Trade.created_at,
+    postgresql_where = _copyable_index_where,
+    sqlite_where = _copyable_index_where
+)
+
+# Substring ILIKE '%x%' filters can only use trigram GIN indexes (Postgres only)
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect = "postgresql")
+)
+Index(
+    "ix_trades_politician_name_trgm", Trade.politician_name,
+    postgresql_using = "gin", postgresql_ops = {"politician_name": "gin_trgm_ops"}
+).ddl_if(dialect = "postgresql")
+Index(
+    "ix_trades_ticker_trgm", Trade.ticker,
+    postgresql_using = "gin", postgresql_ops = {"ticker": "gin_trgm_ops"}
+).ddl_if(dialect = "postgresql")
+
 class Politician(Base):
     __tablename__ = "politicians"
     id = Column(Integer, primary_key=True, index = True)
@@ -77,28 +139,19 @@ class Politician(Base):
     bio_url = Column(String(500))
     twitter_handle = Column(String(50))
 
+    trades = relationship("Trade", back_populates = "politician", lazy = "raise")
+
     created_at = Column(DateTime, default = datetime.now(timezone.utc))
     updated_at = Column(DateTime, default = datetime.now(timezone.utc), onupdate = datetime.now(timezone.utc))
 
     def __repr__(self):
         return f"Politician: {self.name} ({self.chamber} -- {self.party})"
     
-    def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-            "chamber": self.chamber,
-            "party": self.party,
-            "state": self.state,
-            "district": self.district,
-            "total_trades": self.total_trades,
-            "total_estimated_volume": self.total_estimated_volume,
-            "average_trade_size": self.average_trade_size,
-            "last_trade_date": self.last_trade_date.isoformat() if self.last_trade_date else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "committees": self.committees
-        }
-    
+Index(
+    "ix_politicians_name_trgm", Politician.name,
+    postgresql_using = "gin", postgresql_ops = {"name": "gin_trgm_ops"}
+).ddl_if(dialect = "postgresql")
+
 class User(Base):
     __tablename__ = "users"
 
@@ -140,8 +193,8 @@ class User(Base):
             "is_premium": self.is_premium,
             "subscription_tier": self.subscription_tier,
             "api_calls_today": self.api_calls_today,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "last_login": self.last_login.isoformat() if self.last_login else None
+            "created_at": self.created_at,
+            "last_login": self.last_login
         }
 class TradingAccount(Base):
        __tablename__ = "trading_accounts"
@@ -173,4 +226,10 @@ class BotSettings(Base):
        max_trade_amount = Column(Float, default=1000.0)
        follow_politicians = Column(Text)  # JSON string
        strategy = Column(String(50), default="copy_trades")
-       updated_at = Column(DateTime, default=datetime.now(timezone.utc))
\ No newline at end of file
+       updated_at = Column(DateTime, default=datetime.now(timezone.utc))
+
+class BotFollow(Base):
+       """One row per politician a user's bot copies; joined against trades in SQL."""
+       __tablename__ = "bot_follows"
+       user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+       politician_name = Column(String(100), primary_key=True, index=True)
\ No newline at end of file
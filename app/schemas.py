@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict
+
+# Response models for the public read endpoints. Built straight from ORM rows
+# (from_attributes) so pydantic-core does the row -> JSON conversion.
+
+class TradeOut(BaseModel):
+    model_config = ConfigDict(from_attributes = True)
+
+    id: int
+    politician_name: str
+    chamber: str
+    party: Optional[str] = None
+    state: Optional[str] = None
+    ticker: str
+    company_name: Optional[str] = None
+    trade_type: str
+    amount_range: Optional[str] = None
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    estimated_amount: Optional[float] = None
+    transaction_date: datetime
+    disclosure_date: datetime
+    disclosure_delay_days: Optional[int] = None
+    stock_price_at_trade: Optional[float] = None
+    committees: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class PoliticianOut(BaseModel):
+    model_config = ConfigDict(from_attributes = True)
+
+    id: int
+    name: str
+    chamber: str
+    party: Optional[str] = None
+    state: Optional[str] = None
+    district: Optional[str] = None
+    total_trades: Optional[int] = None
+    total_estimated_volume: Optional[float] = None
+    average_trade_size: Optional[float] = None
+    last_trade_date: Optional[datetime] = None
+    committees: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class Pagination(BaseModel):
+    total: Optional[int] = None
+    limit: int
+    offset: int
+    has_more: bool
+    next_cursor: Optional[str] = None
+
+class ApiInfo(BaseModel):
+    name: str
+    version: str
+
+class TradeFilters(BaseModel):
+    politician: Optional[str] = None
+    ticker: Optional[str] = None
+    trade_type: Optional[str] = None
+
+class PoliticianFilters(BaseModel):
+    chamber: Optional[str] = None
+    party: Optional[str] = None
+    state: Optional[str] = None
+
+class TradeListResponse(BaseModel):
+    trades: List[TradeOut]
+    pagination: Pagination
+    filters: TradeFilters
+    api_info: ApiInfo
+    timestamp: str
+
+class PoliticianListResponse(BaseModel):
+    politicians: List[PoliticianOut]
+    pagination: Pagination
+    filters: PoliticianFilters
+    timestamp: str
+
+class PoliticianTradesResponse(BaseModel):
+    politician: PoliticianOut
+    trades: List[TradeOut]
+    pagination: Pagination
+    timestamp: str
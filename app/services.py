@@ -1,24 +1,40 @@
 import logging
+import orjson
+from contextlib import closing
 from datetime import datetime, timezone, timedelta
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func
+from sqlalchemy import and_, or_, desc, func, select, text, insert, update, exists, tuple_, table, column, union_all, literal, null, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import ProgrammingError
 
 from app.database import get_db
 from app.models import Trade, Politician, User
-from app.fmp_client import FMPClient, TradeData
+from app.fmp_client import FMPClient, TradeData, iter_sync
 from app.config import get_settings
+from app.cache import cache_get, cache_set, clear_namespace
+from app.schemas import PoliticianOut
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Built once: the expanding IN keeps one compiled-cache entry however many
+# (name, ticker) pairs a batch has
+_EXISTING_TRADE_KEYS = select(
+    Trade.politician_name, Trade.ticker,
+    Trade.transaction_date, Trade.disclosure_date
+).where(tuple_(Trade.politician_name, Trade.ticker).in_(bindparam("pairs", expanding = True)))
+
 class TradeService:
 
     @staticmethod
     def sync_trades_from_fmp(db: Session, limit_per_chamber: int = 100) -> Dict[str, Any]:
-        logger.info(f"Starting trade sunc from FMP (limit: {limit_per_chamber} per chamber)")
+        logger.info("Starting trade sunc from FMP (limit: %s per chamber)", limit_per_chamber)
+        # One clock read stamps every row this sync writes
+        now = datetime.now(timezone.utc)
         sync_stats = {
-            "started_at": datetime.now(timezone.utc),
+            "started_at": now,
             "trades_fetched": 0,
             "trades_stored": 0,
             "trades_updated": 0,
@@ -30,71 +46,47 @@ class TradeService:
 
     
         try:
-            logger.info("Fetching trades from FMP API")
-            import asyncio
-            from app.fmp_client import FMPClient
-            
-            # Create event loop and run async function
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
-            try:
-                async def fetch_data():
-                    async with FMPClient(settings.FMP_API_KEY) as client:
-                        return await client.get_all_trades(limit_per_chamber=limit_per_chamber)
-                
-                trades_data = loop.run_until_complete(fetch_data())
-            finally:
-                loop.close()
-
-            sync_stats["trades_fetched"] = len(trades_data)
-
-            if not trades_data:
+            logger.info("Streaming trades from FMP API")
+            async def fetch_pages():
+                async with FMPClient(settings.FMP_API_KEY) as client:
+                    async for page in client.stream_trades(limit_per_chamber=limit_per_chamber):
+                        yield page
+
+            seen_keys = set()
+            politicians_seen = set()
+            politicians_created = set()
+
+            # Each page is upserted as it arrives; only keys, not trades,
+            # are kept for the whole sync. closing() shuts the stream (and
+            # its in-flight requests) at once if a page fails to store.
+            with closing(iter_sync(fetch_pages())) as pages:
+                for trades_data in pages:
+                    sync_stats["trades_fetched"] += len(trades_data)
+                    politicians, created_names = TradeService._resolve_politicians(db, trades_data, now)
+                    politicians_seen.update(politicians)
+                    politicians_created.update(created_names)
+                    TradeService._store_trade_page(db, trades_data, politicians, seen_keys, now, sync_stats)
+
+            if not sync_stats["trades_fetched"]:
                 logger.warning("No trades returned by FMP API")
                 sync_stats["errors"].append("No trades returned from FMP API")
                 return sync_stats
-            
-            logger.info(f"Fetched {len(trades_data)} from FMP")
-
-            for trade_data in trades_data:
-                try:
-                    politician = TradeService._get_or_create_politician(
-                        db, trade_data.politician_name, trade_data.chamber
-                    )
-                    if not hasattr(politician, "_is_new"):
-                        sync_stats["politicians_created"] +=1
-                    else:
-                        sync_stats["politicians_updated"] +=1
-
-                    existing_trade = db.query(Trade).filter(
-                        and_(
-                            Trade.politician_name == trade_data.politician_name,
-                            Trade.ticker == trade_data.ticker,
-                            Trade.transaction_date == trade_data.transaction_date,
-                            Trade.disclosure_date == trade_data.disclosure_date
-                        )
-                    ).first()
-
-                    if existing_trade:
-                        TradeService._update_trade_from_data(existing_trade, trade_data)
-                        sync_stats["trades_updated"] +=1
-                        logger.debug(f"Updated existing trade: {trade_data.politician_name} - {trade_data.ticker}")
-                    else:
-                        new_trade = TradeService._create_trade_from_data(trade_data)
-                        db.add(new_trade)
-                        sync_stats["trades_stored"] +=1
-                        logger.debug(f"Created new trade: {trade_data.politician_name} - {trade_data.ticker}")
-
-                except Exception as e:
-                    error_msg = f"Error processing trade {trade_data.politician_name} - {trade_data.ticker}: {str(e)}"
-                    logger.error(error_msg)
-                    sync_stats["errors"].append(error_msg)
-                    continue
 
-            TradeService._update_politician_stats(db)
+            logger.info("Fetched %s from FMP", sync_stats["trades_fetched"])
+
+            # Distinct politicians, counted once for the whole sync
+            sync_stats["politicians_created"] = len(politicians_created)
+            sync_stats["politicians_updated"] = len(politicians_seen - politicians_created)
+
+            TradeService._update_politician_stats(db, now)
 
             db.commit()
 
+            AnalyticsService.refresh_views(db)
+
+            # Cached dashboards are stale as soon as new trades land
+            clear_namespace()
+
             sync_stats["completed_at"] = datetime.now(timezone.utc)
             sync_stats["duration_seconds"] = (
                 sync_stats["completed_at"] - sync_stats["started_at"]
@@ -102,7 +94,7 @@ class TradeService:
 
             sync_stats["success"] = True
 
-            logger.info(f"Trade sync completed {sync_stats['trades_stored']} new , {sync_stats['trades_updated']} updated")
+            logger.info("Trade sync completed %s new , %s updated", sync_stats['trades_stored'], sync_stats['trades_updated'])
 
         except Exception as e:
             db.rollback()
@@ -114,94 +106,332 @@ class TradeService:
         return sync_stats
 
     @staticmethod
-    def _get_or_create_politician(db: Session, name: str, chamber: str) -> Politician:
-        politician = db.query(Politician).filter(Politician.name == name).first()
-        
-        if not politician:
-            politician = Politician(
-                name = name,
-                chamber = chamber,
-                created_at = datetime.now(timezone.utc)
+    def _store_trade_page(db: Session, trades_data: List[TradeData], politicians: Dict[str, tuple],
+                          seen_keys: set, now: datetime, sync_stats: Dict[str, Any]):
+        existing_keys = TradeService._existing_trade_keys(db, trades_data)
+        rows = []
+
+        for trade_data in trades_data:
+            try:
+                politician_id, party = politicians[trade_data.politician_name]
+
+                key = TradeService._trade_key(trade_data)
+                if key in seen_keys:
+                    # FMP can repeat a disclosure within one response, and
+                    # ON CONFLICT cannot touch the same row twice
+                    continue
+                seen_keys.add(key)
+
+                rows.append(TradeService._trade_row(trade_data, politician_id, now, party))
+                if key in existing_keys:
+                    sync_stats["trades_updated"] +=1
+                    logger.debug("Updated existing trade: %s - %s", trade_data.politician_name, trade_data.ticker)
+                else:
+                    sync_stats["trades_stored"] +=1
+                    logger.debug("Created new trade: %s - %s", trade_data.politician_name, trade_data.ticker)
+
+            except Exception as e:
+                error_msg = f"Error processing trade {trade_data.politician_name} - {trade_data.ticker}: {str(e)}"
+                logger.error(error_msg)
+                sync_stats["errors"].append(error_msg)
+                continue
+
+        if rows:
+            # One upsert per page against ix_trades_dedup
+            db.execute(TradeService._trade_upsert(db, now), rows)
+
+    @staticmethod
+    def _resolve_politicians(db: Session, trades_data: List[TradeData], now: datetime):
+        """Map every politician name in the batch to its (id, party).
+
+        Known politicians come from one preload query; the missing ones are
+        created with one bulk INSERT ... RETURNING. Returns the name ->
+        (id, party) map and the set of names created by this call.
+        """
+        chambers = {}
+        for trade_data in trades_data:
+            chambers.setdefault(trade_data.politician_name, trade_data.chamber)
+
+        # FMP trades carry no party; trades inherit it from the politician row
+        politicians = {
+            name: (politician_id, party)
+            for name, politician_id, party in db.execute(
+                select(Politician.name, Politician.id, Politician.party).where(Politician.name.in_(chambers))
             )
+        }
 
-            db.add(politician)
-            db.flush()
-            politician._is_new = True
-            logger.info(f"Created new politician: {name} ({chamber})")
+        created_names = set(chambers) - set(politicians)
+        if created_names:
+            rows = db.execute(
+                insert(Politician).returning(Politician.name, Politician.id),
+                [{"name": name, "chamber": chambers[name], "created_at": now} for name in created_names]
+            ).all()
+            politicians.update((name, (politician_id, None)) for name, politician_id in rows)
+            logger.info("Created %s new politicians", len(created_names))
+
+        return politicians, created_names
+
+    @staticmethod
+    def _trade_row(trade_data: TradeData, politician_id: Optional[int], now: datetime,
+                   party: Optional[str] = None) -> Dict[str, Any]:
+        row = {
+            "politician_name": trade_data.politician_name,
+            "politician_id": politician_id,
+            "chamber": trade_data.chamber,
+            "party": party,
+            "ticker": trade_data.ticker,
+            "trade_type": trade_data.trade_type,
+            "estimated_amount": trade_data.amount,
+            "transaction_date": trade_data.transaction_date,
+            "disclosure_date": trade_data.disclosure_date,
+            "processed_for_trading": False,
+            "source": "FMP",
+            "created_at": now
+        }
+        # Bulk INSERT skips ORM events, so derived columns are filled here
+        row.update(Trade.derived_fields(
+            trade_data.transaction_date, trade_data.disclosure_date,
+            estimated_amount = trade_data.amount
+        ))
+        return row
 
-        return politician
-    
     @staticmethod
-    def _create_trade_from_data(trade_data: TradeData) -> Trade:
-        disclosure_delay = (trade_data.disclosure_date - trade_data.transaction_date).days
-
-        return Trade(
-            politician_name = trade_data.politician_name,
-            chamber = trade_data.chamber,
-            ticker = trade_data.ticker,
-            trade_type = trade_data.trade_type,
-
-            estimated_amount = trade_data.amount,
-
-            transaction_date = trade_data.transaction_date,
-            disclosure_date = trade_data.disclosure_date,
-            disclosure_delay_days = disclosure_delay,
-            processed_for_trading = False,
-            source = "FMP",
-            created_at = datetime.now(timezone.utc)
+    def _trade_key(trade_data: TradeData) -> tuple:
+        return (
+            trade_data.politician_name, trade_data.ticker,
+            trade_data.transaction_date, trade_data.disclosure_date
         )
-    
+
     @staticmethod
-    def _update_trade_from_data(existing_trade: Trade, trade_data: TradeData):
-        existing_trade.estimated_amount = trade_data.amount
-        existing_trade.trade_type = trade_data.trade_type
-        existing_trade.updated_at = datetime.now(timezone.utc)
+    def _existing_trade_keys(db: Session, trades_data: List[TradeData]) -> set:
+        """Dedup keys of this batch already stored, in one query; only feeds the counters."""
+        pairs = list({(trade_data.politician_name, trade_data.ticker) for trade_data in trades_data})
+        rows = db.execute(_EXISTING_TRADE_KEYS, {"pairs": pairs}).all()
+        return {tuple(row) for row in rows}
 
-        disclosure_delay = (trade_data.disclosure_date - trade_data.transaction_date).days
-        existing_trade.disclosure_delay_days = disclosure_delay
+    @staticmethod
+    def _trade_upsert(db: Session, now: datetime):
+        """INSERT ... ON CONFLICT DO UPDATE on the dedup key, for Postgres and SQLite."""
+        if db.get_bind().dialect.name == "postgresql":
+            stmt = pg_insert(Trade)
+        else:
+            stmt = sqlite_insert(Trade)
+        # The date columns are part of the conflict key, so the derived delay
+        # cannot change on update
+        return stmt.on_conflict_do_update(
+            index_elements = [
+                Trade.politician_name, Trade.ticker,
+                Trade.transaction_date, Trade.disclosure_date
+            ],
+            set_ = {
+                "politician_id": stmt.excluded.politician_id,
+                # Picks up a party filled in on the politician after the first sync
+                "party": stmt.excluded.party,
+                "estimated_amount": stmt.excluded.estimated_amount,
+                "trade_type": stmt.excluded.trade_type,
+                "updated_at": now
+            }
+        )
 
     @staticmethod
-    def _update_politician_stats(db: Session):
+    def _update_politician_stats(db: Session, now: Optional[datetime] = None):
         logger.info("Updating politician statistics...")
 
-        politicians = db.query(Politician).all()
+        # The session does not autoflush; make this sync's new trades visible
+        db.flush()
+
+        # One grouped pass over trades joined straight into the UPDATE
+        # (UPDATE ... FROM); the aggregates never leave the database
+        totals = (
+            select(
+                Trade.politician_id,
+                func.count(Trade.id).label("trade_count"),
+                func.coalesce(func.sum(Trade.estimated_amount), 0).label("total_volume"),
+                func.max(Trade.transaction_date).label("last_trade_date")
+            )
+            .where(Trade.politician_id.is_not(None))
+            .group_by(Trade.politician_id)
+            .subquery()
+        )
 
-        for politician in politicians:
-            trades = db.query(Trade).filter(Trade.politician_name == politician.name).all()
-            if trades:
-                politician.total_trades = len(trades)
-                politician.total_estimated_volume = sum(trade.estimated_amount or 0 for trade in trades)
-                politician.average_trade_size = politician.total_estimated_volume / politician.total_trades
-                politician.last_trade_date = max(trade.transaction_date for trade in trades)
+        if now is None:
+            now = datetime.now(timezone.utc)
+        updated = db.execute(
+            update(Politician)
+            .where(Politician.id == totals.c.politician_id)
+            .values(
+                total_trades = totals.c.trade_count,
+                total_estimated_volume = totals.c.total_volume,
+                average_trade_size = totals.c.total_volume / totals.c.trade_count,
+                last_trade_date = totals.c.last_trade_date,
+                updated_at = now
+            )
+            .execution_options(synchronize_session = False)
+        ).rowcount
+
+        db.execute(
+            update(Politician)
+            .where(~exists().where(Trade.politician_id == Politician.id))
+            .values(
+                total_trades = 0,
+                total_estimated_volume = 0.0,
+                average_trade_size = 0.0,
+                last_trade_date = None,
+                updated_at = now
+            )
+            .execution_options(synchronize_session = False)
+        )
 
-            else:
-                politician.total_trades = 0
-                politician.total_estimated_volume = 0.0
-                politician.average_trade_size = 0.0
-                politician.last_trade_date = None
+        logger.info("Updated statistics for %s politicians with trades", updated)
 
-            politician.updated_at = datetime.now(timezone.utc)
+# Trader rankings only move when a sync lands (hourly), and every sync clears
+# the "api" cache namespace
+_TRADER_CACHE_SECONDS = 3600
 
-        logger.info(f"Updated statistics for {len(politicians)} politicians")
+def _cached_politicians(key: str, query) -> List[Dict[str, Any]]:
+    hit = cache_get(f"api:{key}")
+    if hit is not None:
+        return orjson.loads(hit)
+    politicians = [
+        PoliticianOut.model_validate(politician).model_dump(mode = "json")
+        for politician in query.all()
+    ]
+    cache_set(f"api:{key}", orjson.dumps(politicians), _TRADER_CACHE_SECONDS)
+    return politicians
 
 class PoliticianService:
     @staticmethod
-    def get_top_traders(db: Session, limit: int = 10) -> List[Politician]:
-        return db.query(Politician).filter(
+    def get_top_traders(db: Session, limit: int = 10) -> List[Dict[str, Any]]:
+        return _cached_politicians(f"politicians:top:{limit}", db.query(Politician).filter(
             Politician.total_estimated_volume > 0
         ).order_by(
             desc(Politician.total_estimated_volume)
-        ).limit(limit).all()
+        ).limit(limit))
 
     @staticmethod
-    def get_recent_traders(db: Session, days: int = 30, limit: int = 10) -> List[Politician]:
+    def get_recent_traders(db: Session, days: int = 30, limit: int = 10) -> List[Dict[str, Any]]:
         cutoff_date = datetime.now(timezone.utc) - timedelta(days = days)
-        return db.query(Politician).filter(
+        return _cached_politicians(f"politicians:recent:{days}:{limit}", db.query(Politician).filter(
             Politician.last_trade_date > cutoff_date
         ).order_by(
             desc(Politician.last_trade_date)
-        ).limit(limit).all()
-    
+        ).limit(limit))
+
+_mv_trade_summary = table(
+    "mv_trade_summary",
+    column("total_politicians"), column("total_trades"), column("total_volume"),
+    column("avg_trade_size"), column("max_trade"), column("min_trade")
+)
+_mv_party_breakdown = table("mv_party_breakdown", column("party"), column("trade_count"), column("total_volume"))
+_mv_top_traders = table("mv_top_traders", column("politician_name"), column("trade_count"), column("total_volume"))
+
+class AnalyticsService:
+    # Created by migration 0005; refreshed at the end of every sync
+    VIEWS = ("mv_trade_summary", "mv_party_breakdown", "mv_top_traders")
+
+    @staticmethod
+    def get_summary(db: Session) -> Dict[str, Any]:
+        if db.get_bind().dialect.name == "postgresql":
+            try:
+                return AnalyticsService._run(db, _mv_trade_summary, _mv_party_breakdown, _mv_top_traders)
+            except ProgrammingError as e:
+                # Schema built by create_all rather than migrations has no views
+                db.rollback()
+                logger.warning("Analytics views unavailable, aggregating live: %s", e)
+        return AnalyticsService._run(db, *AnalyticsService._live_sources())
+
+    @staticmethod
+    def refresh_views(db: Session):
+        if db.get_bind().dialect.name != "postgresql":
+            return
+        try:
+            for view in AnalyticsService.VIEWS:
+                db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"))
+            db.commit()
+        except ProgrammingError as e:
+            db.rollback()
+            logger.warning("Could not refresh analytics views: %s", e)
+
+    @staticmethod
+    def _live_sources():
+        """CTEs with the same columns as the materialized views."""
+        stats = select(
+            select(func.count()).select_from(Politician).scalar_subquery().label('total_politicians'),
+            func.count(Trade.id).label('total_trades'),
+            func.sum(Trade.estimated_amount).label('total_volume'),
+            func.avg(Trade.estimated_amount).label('avg_trade_size'),
+            func.max(Trade.estimated_amount).label('max_trade'),
+            func.min(Trade.estimated_amount).label('min_trade')
+        ).cte("stats")
+
+        party = select(
+            Trade.party,
+            func.count(Trade.id).label('trade_count'),
+            func.sum(Trade.estimated_amount).label('total_volume')
+        ).group_by(Trade.party).cte("party")
+
+        top = select(
+            Trade.politician_name,
+            func.count(Trade.id).label('trade_count'),
+            func.sum(Trade.estimated_amount).label('total_volume')
+        ).group_by(Trade.politician_name).order_by(func.sum(Trade.estimated_amount).desc()).limit(10).cte("top")
+
+        return stats, party, top
+
+    @staticmethod
+    def _run(db: Session, stats, party, top) -> Dict[str, Any]:
+        # One round trip: every section comes back as rows tagged by kind
+        rows = db.execute(union_all(
+            select(
+                literal("stats").label("kind"), null().label("name"),
+                stats.c.total_trades.label("trade_count"), stats.c.total_volume,
+                stats.c.avg_trade_size, stats.c.max_trade, stats.c.min_trade, stats.c.total_politicians
+            ),
+            select(
+                literal("party"), party.c.party, party.c.trade_count, party.c.total_volume,
+                null(), null(), null(), null()
+            ),
+            select(
+                literal("top"), top.c.politician_name, top.c.trade_count, top.c.total_volume,
+                null(), null(), null(), null()
+            )
+        )).all()
+
+        summary = {}
+        party_breakdown = []
+        top_traders = []
+        for row in rows:
+            if row.kind == "stats":
+                summary = {
+                    "total_politicians": row.total_politicians,
+                    "total_trades": row.trade_count,
+                    "total_volume": float(row.total_volume or 0),
+                    "average_trade_size":float(row.avg_trade_size or 0),
+                    "largest_trade":float(row.max_trade or 0),
+                    "smallest_trade":float(row.min_trade or 0)
+                }
+            elif row.kind == "party":
+                party_breakdown.append({
+                    "party": row.name,
+                    "trade_count": row.trade_count,
+                    "total_volume": float(row.total_volume or 0)
+                })
+            else:
+                top_traders.append({
+                    "politician": row.name,
+                    "trade_count": row.trade_count,
+                    "total_volume": float(row.total_volume or 0)
+                })
+
+        # UNION ALL does not preserve the per-branch ORDER BY
+        top_traders.sort(key = lambda trader: trader["total_volume"], reverse = True)
+
+        return {
+            "summary": summary,
+            "party_breakdown": party_breakdown,
+            "top_traders": top_traders
+        }
+
 def test_trade_service():
     print("Testing...")
 
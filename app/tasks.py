@@ -3,8 +3,12 @@ from datetime import datetime, timezone, timedelta
 from typing import Dict, Any
 from celery import Celery
 from celery.schedules import crontab
+from celery.signals import worker_process_init
+from sqlalchemy import text
+from app.cache import clear_namespace
 from app.config import get_settings
-from app.database import SessionLocal
+from app.database import TaskSession, engine
+from app.models import Politician
 from app.services import TradeService, PoliticianService
 import os
 
@@ -59,11 +63,23 @@ celery_app.conf.beat_schedule = {
 }
 
 
+@worker_process_init.connect
+def _warm_worker_engine(**kwargs):
+    # Pool connections inherited from the parent must not be shared across
+    # the fork; open a fresh one now so the first task skips the handshake
+    engine.dispose(close = False)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except Exception as e:
+        logger.warning("Could not pre-warm database pool: %s", e)
+
+
 @celery_app.task(bind = True, name = "app.tasks.sync_trades_task")
 def sync_trades_task(self, limit_per_chamber: int = 100) -> Dict[str, Any]:
     task_id = self.request.id
-    logger.info(f"Starting trade sync task {task_id} (limit: {limit_per_chamber})")
-    db = SessionLocal()
+    logger.info("Starting trade sync task %s (limit: %s)", task_id, limit_per_chamber)
+    db = TaskSession()
 
     try:
         sync_result = TradeService.sync_trades_from_fmp(db, limit_per_chamber)
@@ -74,41 +90,41 @@ def sync_trades_task(self, limit_per_chamber: int = 100) -> Dict[str, Any]:
             "limit_per_chamber": limit_per_chamber
         })
 
-        if sync_result["sucess"]:
+        if sync_result["success"]:
             logger.info(
-                f"trade sync task {task_id} completed successfully"
-                f"{sync_result['trades_stored']} stored, {sync_result['trades_updated']} updated"
+                "Trade sync task %s completed successfully: %s stored, %s updated",
+                task_id, sync_result["trades_stored"], sync_result["trades_updated"]
             )
         else:
-            logger.error(f"Trade sync task {task_id} failed: {sync_result.get('errors', [])}")
+            logger.error("Trade sync task %s failed: %s", task_id, sync_result.get('errors', []))
 
         return sync_result
     except Exception as e:
-        error_mgs = f"Trade sync task {task_id} failed with exception {str(e)}"
-        logger.error(error_mgs)
+        logger.error("Trade sync task %s failed with exception %s", task_id, e)
 
         raise self.retry(exc = e, countdown = 60, max_retries = 3)
     
     finally:
-        db.close()
+        TaskSession.remove()
 
 @celery_app.task(bind = True, name = "app.tasks.update_politician_stats_task")
 def update_politician_stats_task(self) -> Dict[str, Any]:
     task_id = self.request.id
-    logger.info(f"Starting politician stats update task {task_id}")
+    logger.info("Starting politician stats update task %s", task_id)
 
-    db = SessionLocal()
+    db = TaskSession()
 
     try:
         start_time = datetime.now(timezone.utc)
 
         TradeService._update_politician_stats(db)
         db.commit()
+        # Cached trader rankings are built from these totals
+        clear_namespace()
 
         end_time = datetime.now(timezone.utc)
         duration = (end_time - start_time).total_seconds()
 
-        from app.models import Politician
         politician_count = db.query(Politician).count()
         result = {
             "task_id": task_id,
@@ -120,7 +136,7 @@ def update_politician_stats_task(self) -> Dict[str, Any]:
             "success": True
         }
 
-        logger.info(f"Politician stats task {task_id} completed: {politician_count} politicians updated")
+        logger.info("Politician stats task %s completed: %s politicians updated", task_id, politician_count)
 
         return result
     except Exception as e:
@@ -131,12 +147,12 @@ def update_politician_stats_task(self) -> Dict[str, Any]:
         raise self.retry(exc = e, countdown = 60, max_retries = 3)
     
     finally:
-        db.close()
+        TaskSession.remove()
 
 @celery_app.task(bind = True, name = "app.tasks.cleanup_task")
 def cleanup_task(self, days_to_keep: int = 90) -> Dict[str,Any]:
     task_id = self.request.id
-    logger.info(f"Starting cleanup task {task_id} (keeping {days_to_keep} days)")
+    logger.info("Starting cleanup task %s (keeping %s days)", task_id, days_to_keep)
 
     try:
         start_time = datetime.now(timezone.utc)
@@ -159,7 +175,7 @@ def cleanup_task(self, days_to_keep: int = 90) -> Dict[str,Any]:
             "success": True
         }
 
-        logger.info(f"Cleanup task {task_id} completed: {cleanup_count} items cleaned")
+        logger.info("Cleanup task %s completed: %s items cleaned", task_id, cleanup_count)
         return result
 
     except Exception as e:
@@ -170,9 +186,9 @@ def cleanup_task(self, days_to_keep: int = 90) -> Dict[str,Any]:
 
 @celery_app.task(name = "app.tasks.manual_sync_task")
 def manual_sync_task(limit_per_chamber: int = 20) -> str:
-    logger.info(f"Manual sync task started (limit: {limit_per_chamber})")
+    logger.info("Manual sync task started (limit: %s)", limit_per_chamber)
 
-    db = SessionLocal()
+    db = TaskSession()
 
     try:
         result = TradeService.sync_trades_from_fmp(db, limit_per_chamber)
@@ -190,7 +206,7 @@ def manual_sync_task(limit_per_chamber: int = 20) -> str:
         return error_msg
 
     finally:
-        db.close()
+        TaskSession.remove()
 
 def test_celery_connection():
     print("Testing celery connection")
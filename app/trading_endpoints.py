@@ -1,20 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from app.database import get_db
 from app.auth import get_current_active_user
-from app.models import User, BotSettings, TradingAccount, BotTrade
+from app.models import User, BotSettings, BotFollow, TradingAccount, BotTrade
 from app.trading_service import TradingService
 import json
 
 router = APIRouter(prefix="/api/trading", tags=["Trading Bot"])
 
+DEFAULT_FOLLOWS = ["Nancy Pelosi"]
+
 class AlpacaAccountCreate(BaseModel):
     api_key: str
     secret_key: str
 
 @router.post("/account/connect")
-async def connect_alpaca_account(
+def connect_alpaca_account(
     account_data: AlpacaAccountCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -46,7 +49,7 @@ async def connect_alpaca_account(
     return {"message": "Alpaca account connected successfully"}
 
 @router.post("/bot/start")
-async def start_bot(
+def start_bot(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -60,9 +63,15 @@ async def start_bot(
     if not settings:
         settings = BotSettings(
             user_id=current_user.id,
-            follow_politicians=json.dumps(["Nancy Pelosi"]) 
+            follow_politicians=json.dumps(DEFAULT_FOLLOWS) 
         )
         db.add(settings)
+        # The copy-trade matcher joins on bot_follows, not the JSON column
+        db.add_all(
+            BotFollow(user_id=current_user.id, politician_name=name)
+            for name in DEFAULT_FOLLOWS
+            if db.get(BotFollow, (current_user.id, name)) is None
+        )
     
     settings.is_active = True
     db.commit()
@@ -70,20 +79,26 @@ async def start_bot(
     return {"message": "Trading bot started", "status": "active"}
 
 @router.get("/bot/status")
-async def get_bot_status(
+def get_bot_status(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """Get bot status"""
     
     settings = db.query(BotSettings).filter_by(user_id=current_user.id).first()
-    trades = db.query(BotTrade).filter_by(user_id=current_user.id).all()
-    
-    total_pnl = sum(trade.profit_loss or 0 for trade in trades)
+    total_pnl, total_trades = db.query(
+        func.coalesce(func.sum(BotTrade.profit_loss), 0),
+        func.count(BotTrade.id)
+    ).filter(BotTrade.user_id == current_user.id).one()
     
     return {
         "is_active": settings.is_active if settings else False,
-        "total_trades": len(trades),
+        "total_trades": total_trades,
         "total_pnl": total_pnl,
-        "followed_politicians": json.loads(settings.follow_politicians) if settings else []
+        # bot_follows is what the copy-trade matcher joins on, so report that
+        "followed_politicians": db.scalars(
+            select(BotFollow.politician_name)
+            .where(BotFollow.user_id == current_user.id)
+            .order_by(BotFollow.politician_name)
+        ).all() if settings else []
     }
\ No newline at end of file
@@ -1,98 +1,101 @@
+import asyncio
 import logging
+from typing import List
+from sqlalchemy import and_, insert, select
 from sqlalchemy.orm import Session
-from app.models import Trade, User, BotTrade, BotSettings, TradingAccount
-from app.alpaca_client import AlpacaClient
+from app.models import Trade, BotTrade, BotSettings, BotFollow, TradingAccount, copyable_trade_conditions
+from app.alpaca_client import AsyncAlpacaClient
+from app.fmp_client import run_sync
 
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_ORDERS = 10
+
 class TradingService:
-    
-    @staticmethod
-    def process_new_congressional_trade(trade: Trade, db: Session):
-        """Process new congressional trade for all active bots"""
-        
-       
-        active_users = db.query(User).join(BotSettings).join(TradingAccount).filter(
-            BotSettings.is_active == True,
-            TradingAccount.is_active == True
-        ).all()
-        
-        logger.info(f"Processing trade {trade.politician_name} {trade.ticker} for {len(active_users)} users")
-        
-        for user in active_users:
-            try:
-                if TradingService.should_copy_trade(trade, user.bot_settings):
-                    TradingService.execute_copy_trade(trade, user, db)
-            except Exception as e:
-                logger.error(f"Failed to process trade for user {user.id}: {e}")
-    
+
     @staticmethod
-    def should_copy_trade(trade: Trade, settings: BotSettings) -> bool:
-        """Decide if we should copy this trade"""
-        
-        
-        import json
-        try:
-            followed = json.loads(settings.follow_politicians or "[]")
-        except:
-            followed = []
-        
-        
-        if trade.politician_name not in followed:
-            return False
-        
-        
-        if trade.trade_type.lower() != "buy":
-            return False
-            
-        
-        if trade.estimated_amount < 15000:
-            return False
-            
-        return True
-    
+    def copy_trade_candidates(trade_ids: List[int]):
+        """(trade, account, settings) rows for every active bot that should copy each trade.
+
+        The follow / trade-type / amount rule is applied in the join, so no
+        per-user JSON parsing or Python filtering is needed.
+        """
+        return (
+            select(Trade, TradingAccount, BotSettings)
+            .join(BotFollow, BotFollow.politician_name == Trade.politician_name)
+            .join(BotSettings, and_(
+                BotSettings.user_id == BotFollow.user_id,
+                BotSettings.is_active == True
+            ))
+            .join(TradingAccount, and_(
+                TradingAccount.user_id == BotFollow.user_id,
+                TradingAccount.is_active == True
+            ))
+            .where(
+                Trade.id.in_(trade_ids),
+                *copyable_trade_conditions()
+            )
+        )
+
     @staticmethod
-    def execute_copy_trade(trade: Trade, user: User, db: Session):
-        """Execute the actual trade via Alpaca"""
-        
-        try:
-            
-            trading_account = user.trading_account
-            if not trading_account:
-                logger.error(f"User {user.id} has no trading account")
-                return
-            
-           
-            alpaca = AlpacaClient(
+    def process_new_congressional_trades(trade_ids: List[int], db: Session) -> int:
+        """Copy the given trades for all active bots following their politicians.
+
+        Orders are submitted concurrently on the background loop; the bot
+        trades they produce are then inserted in one batch. The caller commits.
+        """
+
+        if not trade_ids:
+            return 0
+
+        candidates = db.execute(TradingService.copy_trade_candidates(trade_ids)).all()
+        logger.info("Copying %s trades for %s bot/trade pairs", len(trade_ids), len(candidates))
+
+        # Plain values only: the ORM rows must not be touched from the loop thread
+        order_requests = [
+            (
                 trading_account.alpaca_api_key,
                 trading_account.alpaca_secret_key,
-                paper=True
-            )
-            
-            
-            trade_amount = min(
-                user.bot_settings.max_trade_amount,
-                trade.estimated_amount * 0.1
-            )
-            
-           
-            order = alpaca.buy_stock(trade.ticker, trade_amount)
-            
-          
-            bot_trade = BotTrade(
-                user_id=user.id,
-                congressional_trade_id=trade.id,
-                symbol=trade.ticker,
-                side="buy",
-                quantity=float(order.qty) if order.qty else 0,
-                price=float(order.filled_avg_price) if order.filled_avg_price else 0,
-                alpaca_order_id=str(order.id)
+                trade.ticker,
+                min(bot_settings.max_trade_amount, trade.estimated_amount * 0.1)
             )
-            db.add(bot_trade)
-            db.commit()
-            
-            logger.info(f"Executed copy trade: User {user.id} bought ${trade_amount} of {trade.ticker}")
-            
-        except Exception as e:
-            logger.error(f"Failed to execute copy trade: {e}")
-            raise
\ No newline at end of file
+            for trade, trading_account, bot_settings in candidates
+        ]
+        orders = run_sync(TradingService._submit_copy_orders(order_requests))
+
+        rows = []
+        for (trade, trading_account, _), order in zip(candidates, orders):
+            if isinstance(order, BaseException):
+                logger.error("Failed to process trade for user %s: %s", trading_account.user_id, order)
+                continue
+            rows.append({
+                "user_id": trading_account.user_id,
+                "congressional_trade_id": trade.id,
+                "symbol": trade.ticker,
+                "side": "buy",
+                "quantity": float(order["qty"]) if order.get("qty") else 0,
+                "price": float(order["filled_avg_price"]) if order.get("filled_avg_price") else 0,
+                "alpaca_order_id": str(order["id"])
+            })
+
+        if rows:
+            db.execute(insert(BotTrade), rows)
+        logger.info("Executed %s of %s copy trades", len(rows), len(candidates))
+        return len(rows)
+
+    @staticmethod
+    async def _submit_copy_orders(order_requests: list) -> list:
+        """One buy per (api_key, secret_key, symbol, amount), in order; failures come back as exceptions"""
+        # Alpaca rate-limits per account; this also caps sockets per sync
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_ORDERS)
+
+        async def submit(api_key: str, secret_key: str, symbol: str, amount: float):
+            # Cheap to build (a headers dict); connections come from the shared session
+            alpaca = AsyncAlpacaClient(api_key, secret_key, paper=True)
+            async with semaphore:
+                return await alpaca.buy_stock(symbol, amount)
+
+        return await asyncio.gather(
+            *(submit(*request) for request in order_requests),
+            return_exceptions=True
+        )
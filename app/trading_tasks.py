@@ -1,6 +1,7 @@
 from app.tasks import celery_app
-from app.database import SessionLocal
-from app.models import Trade
+from sqlalchemy import update
+from app.database import TaskSession
+from app.models import Trade, copyable_trade_conditions
 from app.trading_service import TradingService
 from datetime import datetime, timezone, timedelta
 import logging
@@ -11,27 +12,37 @@ logger = logging.getLogger(__name__)
 def process_new_congressional_trades():
     """Process new congressional trades for trading bots"""
     
-    db = SessionLocal()
+    db = TaskSession()
     try:
         
         cutoff = datetime.now(timezone.utc) - timedelta(hours=1)
-        new_trades = db.query(Trade).filter(
-            Trade.created_at > cutoff,
-            Trade.processed_for_trading == False
+        # Flag and fetch in one statement; a second worker running the same
+        # task can no longer pick up (and copy) the same trades
+        new_trade_ids = db.scalars(
+            update(Trade)
+            .where(
+                Trade.created_at > cutoff,
+                Trade.processed_for_trading == False,
+                # Only trades a bot could copy; served by ix_trades_copy_candidates
+                *copyable_trade_conditions()
+            )
+            .values(processed_for_trading=True)
+            .returning(Trade.id)
         ).all()
+        # Commit the claim on its own: orders placed below cannot be undone,
+        # so a later failure must leave these trades claimed, not replayable
+        db.commit()
         
-        logger.info(f"Processing {len(new_trades)} new congressional trades")
+        logger.info("Processing %s new congressional trades", len(new_trade_ids))
         
-        for trade in new_trades:
-            TradingService.process_new_congressional_trade(trade, db)
-            trade.processed_for_trading = True
+        TradingService.process_new_congressional_trades(new_trade_ids, db)
         
         db.commit()
         logger.info("✅ Congressional trades processed successfully")
         
     except Exception as e:
         db.rollback()
-        logger.error(f"❌ Failed to process congressional trades: {e}")
+        logger.error("❌ Failed to process congressional trades: %s", e)
         raise
     finally:
-        db.close()
\ No newline at end of file
+        TaskSession.remove()
\ No newline at end of file
@@ -0,0 +1,36 @@
+import multiprocessing
+import os
+
+# Production entrypoint: gunicorn -c gunicorn.conf.py app.main:app
+# One uvicorn event loop per worker, so every core serves requests.
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Every worker has its own engine and pool, so the database sees
+# workers * (pool_size + max_overflow) connections at peak. Split a fixed
+# budget across workers; the default 80 leaves 20 of Postgres's default
+# max_connections = 100 for the Celery workers, migrations and psql.
+# Explicit DB_POOL_SIZE / DB_MAX_OVERFLOW still win.
+db_connection_budget = int(os.getenv("DB_CONNECTION_BUDGET", 80))
+_per_worker = max(2, db_connection_budget // workers)
+os.environ.setdefault("DB_POOL_SIZE", str(_per_worker // 2))
+os.environ.setdefault("DB_MAX_OVERFLOW", str(_per_worker - _per_worker // 2))
+keepalive = 5
+timeout = 60
+graceful_timeout = 30
+
+# Import the app once in the master and fork it; workers start faster and
+# share the imported code pages
+preload_app = True
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+def post_fork(server, worker):
+    # The engine was built in the master at import time; each worker must
+    # open its own connections rather than inherit the parent's pool
+    from app.database import engine
+    engine.dispose(close = False)
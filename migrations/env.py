@@ -0,0 +1,55 @@
+from logging.config import fileConfig
+from sqlalchemy import engine_from_config, pool
+from alembic import context
+from app.database import Base, database_url
+import app.models  # noqa: F401 - registers every table on Base.metadata
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+config.set_main_option("sqlalchemy.url", database_url)
+
+target_metadata = Base.metadata
+
+def include_object(obj, name, type_, reflected, compare_to):
+    # Indexes declared with .ddl_if(dialect=...) only exist on that backend
+    ddl_if = getattr(obj, "_ddl_if", None)
+    if type_ == "index" and ddl_if is not None and ddl_if.dialect is not None:
+        return ddl_if.dialect == context.get_context().dialect.name
+    return True
+
+def run_migrations_offline():
+    context.configure(
+        url = database_url,
+        target_metadata = target_metadata,
+        include_object = include_object,
+        literal_binds = True,
+        dialect_opts = {"paramstyle": "named"}
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    connectable = engine_from_config(
+        config.get_section(config.config_ini_section, {}),
+        prefix = "sqlalchemy.",
+        poolclass = pool.NullPool
+    )
+
+    with connectable.connect() as connection:
+        context.configure(
+            connection = connection,
+            target_metadata = target_metadata,
+            include_object = include_object
+        )
+
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,41 @@
+"""trade filter indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-14 04:28:41.196411
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ("ix_trades_politician_date", ["politician_name", "transaction_date"]),
+    ("ix_trades_ticker_date", ["ticker", "transaction_date"]),
+    ("ix_trades_party", ["party"]),
+    ("ix_trades_created_at", ["created_at"]),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps trades writable while the indexes build on Postgres;
+    # it cannot run inside a transaction, hence the autocommit block.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(name, "trades", columns, unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name="trades", postgresql_concurrently=True)
@@ -0,0 +1,51 @@
+"""trigram search indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-14 05:02:17.418236
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, Sequence[str], None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    ("ix_trades_politician_name_trgm", "trades", "politician_name"),
+    ("ix_trades_ticker_trgm", "trades", "ticker"),
+    ("ix_politicians_name_trgm", "politicians", "name"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # pg_trgm is Postgres-only; other backends keep scanning for ILIKE '%x%'
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        for name, table, column in INDEXES:
+            op.create_index(
+                name, table, [column], unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
@@ -0,0 +1,47 @@
+"""trade politician fk
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-14 05:31:06.270114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, Sequence[str], None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('trades') as batch_op:
+        batch_op.add_column(sa.Column('politician_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_trades_politician_id', 'politicians', ['politician_id'], ['id'])
+
+    # Trades were linked to politicians by name until now
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute(
+            "UPDATE trades t SET politician_id = p.id "
+            "FROM politicians p WHERE t.politician_name = p.name"
+        )
+    else:
+        op.execute(
+            "UPDATE trades SET politician_id = "
+            "(SELECT p.id FROM politicians p WHERE p.name = trades.politician_name)"
+        )
+
+    op.create_index('ix_trades_politician_id_date', 'trades', ['politician_id', 'transaction_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_trades_politician_id_date', table_name='trades')
+    with op.batch_alter_table('trades') as batch_op:
+        batch_op.drop_constraint('fk_trades_politician_id', type_='foreignkey')
+        batch_op.drop_column('politician_id')
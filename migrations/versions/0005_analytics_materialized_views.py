@@ -0,0 +1,71 @@
+"""analytics materialized views
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-14 05:58:44.903518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, Sequence[str], None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# REFRESH ... CONCURRENTLY needs a unique index on each view
+VIEWS = (
+    ("mv_trade_summary", """
+        SELECT
+            true AS singleton,
+            (SELECT count(*) FROM politicians) AS total_politicians,
+            count(id) AS total_trades,
+            sum(estimated_amount) AS total_volume,
+            avg(estimated_amount) AS avg_trade_size,
+            max(estimated_amount) AS max_trade,
+            min(estimated_amount) AS min_trade
+        FROM trades
+    """, "singleton"),
+    ("mv_party_breakdown", """
+        SELECT
+            party,
+            count(id) AS trade_count,
+            sum(estimated_amount) AS total_volume
+        FROM trades
+        GROUP BY party
+    """, "party"),
+    ("mv_top_traders", """
+        SELECT
+            politician_name,
+            count(id) AS trade_count,
+            sum(estimated_amount) AS total_volume
+        FROM trades
+        GROUP BY politician_name
+        ORDER BY sum(estimated_amount) DESC NULLS LAST
+        LIMIT 10
+    """, "politician_name"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Other backends aggregate live in AnalyticsService
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for name, query, unique_column in VIEWS:
+        op.execute(f"CREATE MATERIALIZED VIEW {name} AS {query}")
+        op.execute(f"CREATE UNIQUE INDEX ix_{name}_{unique_column} ON {name} ({unique_column})")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+
+    for name, _, _ in reversed(VIEWS):
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {name}")
@@ -0,0 +1,41 @@
+"""trade derived fields
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-14 06:24:51.117302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, Sequence[str], None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == "postgresql":
+        delay_days = "EXTRACT(DAY FROM disclosure_date - transaction_date)::integer"
+    else:
+        delay_days = "CAST(julianday(disclosure_date) - julianday(transaction_date) AS INTEGER)"
+
+    op.execute(f"UPDATE trades SET disclosure_delay_days = {delay_days} WHERE disclosure_delay_days IS NULL")
+    op.execute(
+        "UPDATE trades SET estimated_amount = (min_amount + max_amount) / 2 "
+        "WHERE estimated_amount IS NULL AND min_amount IS NOT NULL AND max_amount IS NOT NULL"
+    )
+
+    with op.batch_alter_table('trades') as batch_op:
+        batch_op.alter_column('disclosure_delay_days', existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('trades') as batch_op:
+        batch_op.alter_column('disclosure_delay_days', existing_type=sa.Integer(), nullable=True)
@@ -0,0 +1,50 @@
+"""trade dedup unique index
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-14 07:02:13.540918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, Sequence[str], None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DEDUP_COLUMNS = ["politician_name", "ticker", "transaction_date", "disclosure_date"]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Older syncs could store the same disclosure twice; keep the oldest row
+    # and repoint bot trades at it so the unique index can build.
+    same_key = " AND ".join(f"t2.{column} = t1.{column}" for column in DEDUP_COLUMNS)
+    op.execute(
+        "UPDATE bot_trades SET congressional_trade_id = ("
+        f"SELECT min(t2.id) FROM trades t1 JOIN trades t2 ON {same_key} "
+        "WHERE t1.id = bot_trades.congressional_trade_id"
+        ") WHERE congressional_trade_id IS NOT NULL"
+    )
+    op.execute(
+        "DELETE FROM trades WHERE id NOT IN ("
+        f"SELECT min(id) FROM trades GROUP BY {', '.join(DEDUP_COLUMNS)}"
+        ")"
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_trades_dedup", "trades", DEDUP_COLUMNS,
+            unique=True, postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_trades_dedup", table_name="trades", postgresql_concurrently=True)
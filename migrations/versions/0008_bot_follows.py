@@ -0,0 +1,53 @@
+"""bot follows
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-14 07:31:48.902114
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, Sequence[str], None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bot_follows = op.create_table('bot_follows',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('politician_name', sa.String(length=100), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('user_id', 'politician_name')
+    )
+    op.create_index(op.f('ix_bot_follows_politician_name'), 'bot_follows', ['politician_name'], unique=False)
+
+    # Normalize the JSON follow lists already stored on bot_settings
+    rows = op.get_bind().execute(sa.text(
+        "SELECT user_id, follow_politicians FROM bot_settings "
+        "WHERE user_id IS NOT NULL AND follow_politicians IS NOT NULL"
+    )).all()
+    follows = set()
+    for user_id, follow_politicians in rows:
+        try:
+            names = json.loads(follow_politicians)
+        except ValueError:
+            continue
+        follows.update((user_id, name) for name in names if isinstance(name, str))
+    if follows:
+        op.bulk_insert(bot_follows, [
+            {"user_id": user_id, "politician_name": name} for user_id, name in sorted(follows)
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bot_follows_politician_name'), table_name='bot_follows')
+    op.drop_table('bot_follows')
@@ -0,0 +1,41 @@
+"""trade copy candidates index
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-14 08:05:37.218640
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, Sequence[str], None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Must stay identical to the predicate in app.models.copyable_trade_conditions
+COPYABLE_WHERE = sa.text("trade_type = 'Buy' AND estimated_amount >= 15000")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The copy rule now compares trade_type exactly; fold older spellings in
+    op.execute("UPDATE trades SET trade_type = 'Buy' WHERE lower(trade_type) = 'buy' AND trade_type <> 'Buy'")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_trades_copy_candidates", "trades", ["created_at"], unique=False,
+            postgresql_where=COPYABLE_WHERE, sqlite_where=COPYABLE_WHERE,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_trades_copy_candidates", table_name="trades", postgresql_concurrently=True)
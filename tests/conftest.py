@@ -1,18 +1,25 @@
+import os
+import fnmatch
 import pytest
-import asyncio
+import httpx
+import pytest_asyncio
 from typing import Generator
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("CACHE_ENABLED", "false")
+
 from app.main import app
 from app.database import get_db, Base
 from app.models import User, Trade, Politician
-from app.auth import get_password_hash, create_access_token
+from app.auth import get_password_hash, create_access_token, clear_auth_caches
 from app.config import get_settings
+from app import cache
 
-SQLALCHAMEY_DATABASE_URL = "sqlite:///./test.db"
+# In-memory, so every pytest-xdist worker process gets its own database
+SQLALCHAMEY_DATABASE_URL = "sqlite://"
 
 engine = create_engine(
     SQLALCHAMEY_DATABASE_URL,
@@ -20,23 +27,44 @@ engine = create_engine(
     poolclass = StaticPool
 )
 
+# pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_begin(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
 
 TestingSessionLocal = sessionmaker(autocommit = False, autoflush= False, bind = engine)
 
-@pytest.fixture(scope = "function")
-def db_session():
+@pytest.fixture(scope = "session")
+def db_schema():
+    # In-memory schema built once; tests are isolated by rollback, not DDL
     Base.metadata.create_all(bind = engine)
-    session = TestingSessionLocal()
+    yield
+    Base.metadata.drop_all(bind = engine)
+
+@pytest.fixture(scope = "function")
+def db_session(db_schema):
+    connection = engine.connect()
+    transaction = connection.begin()
+    # commit() inside a test only releases a SAVEPOINT; the outer transaction
+    # is rolled back afterwards
+    session = TestingSessionLocal(bind = connection, join_transaction_mode = "create_savepoint")
 
     try:
         yield session
     finally:
         session.close()
+        transaction.rollback()
+        connection.close()
 
-        Base.metadata.drop_all(bind = engine)
-
-@pytest.fixture(scope = "function")
-def client(db_session):
+@pytest_asyncio.fixture
+async def client(db_session):
+    # Straight to the ASGI app: no TestClient portal thread per request, and
+    # no lifespan, so nothing here may depend on startup state
     def override_get_db():
         try:
             yield db_session
@@ -44,17 +72,78 @@ def client(db_session):
             pass
     
     app.dependency_overrides[get_db] = override_get_db
+    clear_auth_caches()
 
-    with TestClient(app) as test_client:
+    async with httpx.AsyncClient(transport = httpx.ASGITransport(app = app), base_url = "http://test") as test_client:
         yield test_client
     
     app.dependency_overrides.clear()
 
+@pytest_asyncio.fixture
+async def async_client(db_session):
+    connection = db_session.get_bind()
+
+    def override_get_db():
+        # Concurrent requests run on separate threadpool threads, so each
+        # gets its own session joined to the test transaction (no SAVEPOINT
+        # to interleave); only read-only requests should use this client
+        session = Session(bind = connection, join_transaction_mode = "rollback_only")
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    clear_auth_caches()
+
+    async with httpx.AsyncClient(transport = httpx.ASGITransport(app = app), base_url = "http://test") as test_client:
+        yield test_client
+
+    app.dependency_overrides.clear()
+
+class FakeRedis:
+    """Dict-backed stand-in for the few redis.Redis calls app.cache makes."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ex = None):
+        self.store[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    def scan_iter(self, match = "*", count = None):
+        return [key for key in list(self.store) if fnmatch.fnmatchcase(key, match)]
+
+    def close(self):
+        pass
+
+@pytest.fixture(scope = "function")
+def fake_redis(monkeypatch):
+    # Turns the response/user cache on for one test, backed by a dict
+    fake = FakeRedis()
+    monkeypatch.setattr(cache.settings, "CACHE_ENABLED", True)
+    monkeypatch.setattr(cache, "_client", fake)
+    monkeypatch.setattr(cache, "_down_until", 0.0)
+    clear_auth_caches()
+    yield fake
+    clear_auth_caches()
+
+@pytest.fixture(scope = "session")
+def test_password_hash():
+    # Hashed once per run; the user row itself is rolled back after each test
+    return get_password_hash("testpassword123")
+
 @pytest.fixture(scope = "function")
-def test_user(db_session):
+def test_user(db_session, test_password_hash):
     user = User(
         email = "test@example.com",
-        hashed_password = get_password_hash("testpassword123"),
+        hashed_password = test_password_hash,
         full_name = "Test User",
         is_active = True
     )
@@ -64,19 +153,17 @@ def test_user(db_session):
     db_session.refresh(user)
     return user
 
-@pytest.fixture(scope = "function")
-def auth_headers(test_user):
-    token = create_access_token(data = {"sub": test_user.email})
+@pytest.fixture(scope = "session")
+def auth_token():
+    # Signed once per run; the sub matches the email test_user recreates
+    return create_access_token(data = {"sub": "test@example.com"})
 
-    headers =  {
-        "Authorization": f"Bearer {token}"
+@pytest.fixture(scope = "function")
+def auth_headers(test_user, auth_token):
+    return {
+        "Authorization": f"Bearer {auth_token}"
     }
 
-    print(f"DEBUG: token = {token[:50]}...")  # Debug line
-    print(f"DEBUG: headers = {headers}")  
-
-    return headers 
-
 @pytest.fixture(scope = "function")
 def sample_politician(db_session):
     politician = Politician(
@@ -98,9 +185,10 @@ def sample_politician(db_session):
 @pytest.fixture(scope = "function")
 def sample_trades(db_session, sample_politician):
     from datetime import datetime, timezone
-    trades = [
-        Trade(
+    rows = [
+        dict(
             politician_name = "Nancy Pelosi",
+            politician_id = sample_politician.id,
             chamber = "House",
             party = "Democratic",
             ticker = "AAPL",
@@ -111,8 +199,9 @@ def sample_trades(db_session, sample_politician):
             disclosure_delay_days=17,
             source = "Test"
         ),
-        Trade(
+        dict(
             politician_name = "Nancy Pelosi",
+            politician_id = sample_politician.id,
             chamber = "House",
             party = "Democratic",
             ticker = "MSFT",
@@ -124,22 +213,12 @@ def sample_trades(db_session, sample_politician):
             source = "Test"
         )
     ]
-    for trade in trades:
-        db_session.add(trade)
-
+    # One multi-row INSERT ... RETURNING instead of add() + refresh() per trade
+    trades = db_session.scalars(insert(Trade).returning(Trade), rows).all()
     db_session.commit()
 
-    for trade in trades:
-        db_session.refresh(trade)
-
     return trades
 
-@pytest.fixture(scope = "session")
-def event_loop():
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
 @pytest.fixture
 def mock_fmp_data():
     from app.fmp_client import TradeData
@@ -1,9 +1,52 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from datetime import datetime, timedelta, timezone
 import pytest
-from fastapi.testclient import TestClient
+from unittest import mock
+import httpx
+import orjson
+from cachetools import TTLCache
+from fastapi.security import HTTPAuthorizationCredentials
+from jose import jwt as jose_jwt
+from sqlalchemy import func, select, update
+from sqlalchemy import inspect as sqlalchemy_inspect
+
+from app import auth, cache, services, tasks, trading_service, trading_tasks
+from app.auth import UserResponse
+from app.config import get_settings
+from app.alpaca_client import AsyncAlpacaClient
+from app.fmp_client import FMPClient, TradeData
+from app.main import app, get_redis_client
+from app.models import User, Trade, Politician, BotTrade, BotSettings, BotFollow, TradingAccount
+from app.schemas import TradeListResponse, PoliticianListResponse, PoliticianTradesResponse
+from app.services import TradeService, PoliticianService
+from app.tasks import celery_app, manual_sync_task, sync_trades_task
+
+pytestmark = pytest.mark.asyncio
+
+# Request bodies serialized once and sent as raw content
+_JSON_HEADERS = {"content-type": "application/json"}
+_REG_PAYLOAD = {
+    "email": "newuser@test.com",
+    "password": "strongpassword123",
+    "full_name": "New Test User"
+}
+_REG_BODY = orjson.dumps(_REG_PAYLOAD)
+# Same email as the test_user fixture
+_DUPLICATE_REG_BODY = orjson.dumps({
+    "email": "test@example.com",
+    "password": "differentpassword",
+    "full_name": "Different Name"
+})
+_LOGIN_BODY = orjson.dumps({
+    "email": "test@example.com",
+    "password": "testpassword123"
+})
 
 class TestHealthEndpoints:
-    def test_root_endpoint(self, client: TestClient):
-        response = client.get("/")
+    async def test_root_endpoint(self, client: httpx.AsyncClient):
+        response = await client.get("/")
 
         assert response.status_code == 200
 
@@ -14,8 +57,8 @@ class TestHealthEndpoints:
         assert data["status"] == "operational"
         assert "endpoints" in data
 
-    def test_health_endpoint(self, client: TestClient):
-        response = client.get("/heatlth")
+    async def test_health_endpoint(self, client: httpx.AsyncClient):
+        response = await client.get("/health")
 
         assert response.status_code == 200
         data = response.json()
@@ -23,45 +66,58 @@ class TestHealthEndpoints:
         assert "database" in data
         assert "timestamp" in data
 
-class TestAuthenticationEndpoints:
-    def test_user_registration(self, client: TestClient):
-        user_data = {
-            "email": "newuser@test.com",
-            "password": "strongpassword123",
-            "full_name": "New Test User"
-        }
+    async def test_advertised_endpoints_are_routed(self, client: httpx.AsyncClient):
+        # Catches path typos in one place: every URL the root response
+        # advertises must be a real route
+        advertised = (await client.get("/")).json()["endpoints"]
+        routed = {route.path for route in app.routes}
+
+        missing = {name: path for name, path in advertised.items() if path not in routed}
+        assert missing == {}
+
+class TestReadOnlyEndpoints:
+    async def test_readonly_endpoints_concurrent(self, async_client, sample_trades):
+        # Independent GETs dispatched at once; also exercises the endpoints
+        # under concurrent threadpool execution
+        requests = [
+            ("GET", "/", 200),
+            ("GET", "/health", 200),
+            ("GET", "/api/trades", 200),
+            ("GET", "/api/politicians", 200),
+            ("GET", "/api/analytics/summary", 200),
+            ("GET", "/does-not-exist", 404),
+            ("POST", "/", 405),
+        ]
+        responses = await asyncio.gather(
+            *(async_client.request(method, url) for method, url, _ in requests)
+        )
 
-        response = client.post("/auth/register", json = user_data)
+        statuses = {(method, url): response.status_code for (method, url, _), response in zip(requests, responses)}
+        assert statuses == {(method, url): expected for method, url, expected in requests}
+        assert len(responses[2].json()["trades"]) == len(sample_trades)
+
+class TestAuthenticationEndpoints:
+    async def test_user_registration(self, client: httpx.AsyncClient):
+        response = await client.post("/auth/register", content = _REG_BODY, headers = _JSON_HEADERS)
 
         assert response.status_code == 200
         data = response.json()
-        assert data["email"] == user_data["email"]
-        assert data["full_name"] == user_data["full_name"]
-        assert data["is_active"] == True
-        assert "id" in data
+        user = UserResponse.model_validate(data)
+        assert user.email == _REG_PAYLOAD["email"]
+        assert user.full_name == _REG_PAYLOAD["full_name"]
+        assert user.is_active == True
         assert "password" not in data
         assert "hashed_password" not in data
 
-    def test_duplicate_registration_fails(self, client: TestClient, test_user):
-        user_data = {
-            "email": test_user.email,
-            "password": "differentpassword",
-            "full_name": "Different Name"
-        }
-
-        response = client.post("/auth/register", json = user_data)
+    async def test_duplicate_registration_fails(self, client: httpx.AsyncClient, test_user):
+        response = await client.post("/auth/register", content = _DUPLICATE_REG_BODY, headers = _JSON_HEADERS)
 
         assert response.status_code == 400
         data = response.json()
         assert "already registered" in data["detail"].lower()
 
-    def test_user_login_success(self, client: TestClient, test_user):
-        login_data = {
-            "email": test_user.email,
-            "password": "testpassword123"
-        }
-
-        response = client.post("/auth/login", json = login_data)
+    async def test_user_login_success(self, client: httpx.AsyncClient, test_user):
+        response = await client.post("/auth/login", content = _LOGIN_BODY, headers = _JSON_HEADERS)
 
         assert response.status_code == 200
         data = response.json()
@@ -69,130 +125,259 @@ class TestAuthenticationEndpoints:
         assert data["token_type"] == "bearer"
         assert len(data["access_token"]) > 50
 
-    def test_user_login_wrong_password(self, client: TestClient, test_user):
-        login_data = {
-            "email": test_user.email,
-            "password": "wrongpassword"
-        }    
+    @pytest.mark.parametrize("method,path,payload,expected_status,detail_substring", [
+        ("POST", "/auth/login", {"email": "test@example.com", "password": "wrongpassword"}, 401, "incorrect"),
+        ("POST", "/auth/login", {"email": "doesnotexist@test.com", "password": "password"}, 401, None),
+        ("GET", "/auth/me", None, 403, None),
+        ("POST", "/auth/register", {"email": "test@test.com"}, 422, None),
+        ("POST", "/auth/login", {"password": "test123"}, 422, None),
+    ], ids = ["wrong_password", "nonexistent_user", "requires_auth", "register_missing_fields", "login_missing_fields"])
+    async def test_auth_failures(self, client: httpx.AsyncClient, test_user, method, path, payload, expected_status, detail_substring):
+        response = await client.request(method, path, json = payload)
+
+        assert response.status_code == expected_status
+        if detail_substring is not None:
+            assert detail_substring in response.json()["detail"].lower()
+
+    async def test_protected_route_with_auth(self, client: httpx.AsyncClient, auth_headers):
+        response = await client.get("/auth/me", headers = auth_headers)
+        assert response.status_code == 200
+        user = UserResponse.model_validate(response.json())
+        assert user.is_active == True
 
-        response = client.post("/auth/login", json = login_data)
+class TestUserCache:
+    async def test_deactivation_invalidates_local_and_shared_snapshots(self, client: httpx.AsyncClient, fake_redis, db_session, test_user, auth_headers):
+        response = await client.get("/auth/me", headers = auth_headers)
+        assert response.status_code == 200
+        assert "ct:user:test@example.com" in fake_redis.store
+        assert "test@example.com" in auth._user_cache
 
-        assert response.status_code == 401
-        data = response.json()
-        assert "incorrect" in data["detail"].lower()
+        # ORM update: the after_update listener drops both copies
+        test_user.is_active = False
+        db_session.commit()
+        assert "ct:user:test@example.com" not in fake_redis.store
+        assert "test@example.com" not in auth._user_cache
 
-    def test_user_login_nonexistent(self, client: TestClient):
-        login_data = {
-            "email": "doesnotexist@test.com",
-            "password": "password"
-        }
+        response = await client.get("/auth/me", headers = auth_headers)
+        assert response.status_code == 400
 
-        response = client.post("/auth/login", json = login_data)
-        
-        assert response.status_code == 401
+    async def test_other_workers_expire_within_local_ttl(self, client: httpx.AsyncClient, fake_redis, monkeypatch, db_session, test_user, auth_headers):
+        clock = [0.0]
+        monkeypatch.setattr(auth, "_user_cache", TTLCache(
+            maxsize = 10, ttl = get_settings().USER_LOCAL_CACHE_TTL_SECONDS, timer = lambda: clock[0]
+        ))
+        assert (await client.get("/auth/me", headers = auth_headers)).status_code == 200
+
+        # Deactivated by another worker: its listener cleared Redis, but this
+        # process was never told and keeps its local snapshot for a while
+        db_session.execute(update(User).where(User.id == test_user.id).values(is_active = False))
+        db_session.commit()
+        fake_redis.delete("ct:user:test@example.com")
+
+        assert (await client.get("/auth/me", headers = auth_headers)).status_code == 200
+        clock[0] += get_settings().USER_LOCAL_CACHE_TTL_SECONDS + 1
+        assert (await client.get("/auth/me", headers = auth_headers)).status_code == 400
+
+    async def test_cache_hit_never_carries_password_hash(self, fake_redis, db_session, test_user, auth_token):
+        credentials = HTTPAuthorizationCredentials(scheme = "Bearer", credentials = auth_token)
+        auth.get_current_user(credentials, db_session)
+
+        shared = orjson.loads(fake_redis.store["ct:user:test@example.com"])
+        assert "hashed_password" not in shared
+        assert "hashed_password" not in auth._user_cache["test@example.com"]
+
+        cached_user = auth.get_current_user(credentials, db_session)
+        assert cached_user is not test_user
+        assert "hashed_password" in sqlalchemy_inspect(cached_user).unloaded
+
+        # Detached with an identity: a request session (which never loaded
+        # the user) attaching it must not insert a second row
+        db_session.expunge_all()
+        db_session.add(cached_user)
+        db_session.commit()
+        assert db_session.scalar(select(func.count()).select_from(User)) == 1
+
+class TestTokenCache:
+    async def test_cached_token_expires_at_its_exp(self, client: httpx.AsyncClient, monkeypatch, test_user):
+        # Cache TTL far beyond the token's own lifetime
+        monkeypatch.setattr(auth, "_token_cache", TTLCache(maxsize = 10, ttl = 3600))
+        issued = datetime.now(timezone.utc).replace(microsecond = 0)
+        token = jose_jwt.encode(
+            {"sub": test_user.email, "exp": issued + timedelta(seconds = 60)},
+            get_settings().JWT_SECRET_KEY, algorithm = auth.ALGORITHM
+        )
+        headers = {"Authorization": f"Bearer {token}"}
 
-    def test_protected_route_requires_auth(self, client: TestClient):
+        assert (await client.get("/auth/me", headers = headers)).status_code == 200
+        assert len(auth._token_cache) == 1
 
-        response = client.get("/auth/me")
-        assert response.status_code == 403
+        # Both clocks the check reads: the cache's expiry and jose's exp claim
+        later = issued + timedelta(seconds = 61)
 
-    def test_protected_route_with_auth(self, client: TestClient, auth_headers):
-        response = client.get("/auth/me", headers = auth_headers)
-        assert response.status_code == 200
-        data = response.json()
-        assert "email" in data
-        assert "id" in data
-        assert data["is_active"] == True
+        class _Later(datetime):
+            @classmethod
+            def now(cls, tz = None):
+                return later
+
+        monkeypatch.setattr(auth, "time", SimpleNamespace(time = later.timestamp))
+        monkeypatch.setattr(jose_jwt, "datetime", _Later)
+
+        assert len(auth._token_cache) == 1
+        assert (await client.get("/auth/me", headers = headers)).status_code == 401
+
+class TestPasswordCache:
+    async def test_failed_checks_are_never_cached(self, test_password_hash):
+        auth.clear_auth_caches()
+        assert auth.verify_password("wrongpassword", test_password_hash) == False
+        assert len(auth._password_cache) == 0
+
+        assert auth.verify_password("testpassword123", test_password_hash) == True
+        assert len(auth._password_cache) == 1
+        # A cached success must not make a wrong password pass
+        assert auth.verify_password("wrongpassword", test_password_hash) == False
+
+    async def test_password_change_invalidates_entry(self, client: httpx.AsyncClient, db_session, test_user):
+        assert (await client.post("/auth/login", content = _LOGIN_BODY, headers = _JSON_HEADERS)).status_code == 200
+        assert len(auth._password_cache) == 1
+
+        test_user.hashed_password = auth.get_password_hash("changedpassword456")
+        db_session.commit()
+
+        # Keyed on the stored hash too, so the old entry can no longer match
+        assert (await client.post("/auth/login", content = _LOGIN_BODY, headers = _JSON_HEADERS)).status_code == 401
+        changed = orjson.dumps({"email": "test@example.com", "password": "changedpassword456"})
+        assert (await client.post("/auth/login", content = changed, headers = _JSON_HEADERS)).status_code == 200
+
+    async def test_cache_key_never_contains_plaintext(self, test_password_hash):
+        auth.clear_auth_caches()
+        auth.verify_password("testpassword123", test_password_hash)
+
+        (key,) = auth._password_cache.keys()
+        assert key == auth._cache_key("testpassword123", test_password_hash)
+        assert len(key) == 32
+        assert b"testpassword123" not in key
+        assert test_password_hash.encode() not in key
 
 class TestTradeEndpoints:
-    def test_get_trades_empty(self, client: TestClient):
-        response = client.get("/api/trades")
+    async def test_get_trades_empty(self, client: httpx.AsyncClient):
+        response = await client.get("/api/trades")
 
         assert response.status_code == 200
-        data = response.json()
-        assert "trades" in data
-        assert "pagination" in data
-        assert len(data["trades"]) ==0
-        assert data["pagination"]["total"] == 0
+        page = TradeListResponse.model_validate(response.json())
+        assert page.trades == []
+        assert page.pagination.total == 0
 
-    def test_get_trades_with_data(self, client: TestClient, sample_trades):
-        response = client.get("/api/trades")
+    async def test_get_trades_with_data(self, client: httpx.AsyncClient, sample_trades):
+        response = await client.get("/api/trades")
 
         assert response.status_code == 200
-        data = response.json()
-        assert len(data["trades"]) ==2
-        assert data["pagination"]["total"] == 2
-
-        trade = data["trades"][0]
-        assert "politician_name" in trade
-        assert "ticker" in trade
-        assert "trade_type" in trade
-        assert "estimated_amount" in trade
-        assert "transaction_date" in trade
-    def test_get_trades_with_filters(self, client: TestClient, sample_trades):
-        response = client.get("/api/trades?politician=Nancy")
+        # Validating against the response model checks every trade's fields and types
+        page = TradeListResponse.model_validate(response.json())
+        assert len(page.trades) == 2
+        assert page.pagination.total == 2
+
+    @pytest.mark.parametrize("query,expected_count,expected_field,expected_value", [
+        ("politician=Nancy", 2, None, None),
+        ("ticker=AAPL", 1, "ticker", "AAPL"),
+        ("trade_type=Buy", 1, "trade_type", "Buy"),
+    ])
+    async def test_get_trades_with_filters(self, client: httpx.AsyncClient, sample_trades, query, expected_count, expected_field, expected_value):
+        response = await client.get(f"/api/trades?{query}")
         assert response.status_code == 200
         data = response.json()
-        assert len(data["trades"]) ==2
+        assert len(data["trades"]) == expected_count
 
-        response = client.get("/api/trades?ticker=AAPL")
-        assert response.status_code == 200
-        data = response.json()
-        assert len*(data["trades"]) ==1
-        assert data["trades"][0]["ticker"] == "AAPL"
-
-        response = client.get("/api/trades?trade_type=Buy")
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data["trades"]) == 1
-        assert data["trades"][0]["trade_type"] == "Buy"
+        if expected_field is not None:
+            assert data["trades"][0][expected_field] == expected_value
 
-    def test_get_trades_pagination(self, client: TestClient, sample_trades):
-        response = client.get("/api/trades?limit=1&offset=0")
+    async def test_get_trades_pagination(self, client: httpx.AsyncClient, sample_trades):
+        response = await client.get("/api/trades?limit=1&offset=0")
         assert response.status_code == 200
         data = response.json()
         assert len(data["trades"]) ==1 
         assert data["pagination"]["has_more"] == True
 
-        response = client.get("/api/trades?limit=1&offset=1")
+        response = await client.get("/api/trades?limit=1&offset=1")
         assert response.status_code == 200
         data = response.json()
         assert len(data["trades"]) ==1
         assert data["pagination"]["has_more"] == False
 
+    async def test_get_trades_cursor_pagination(self, client: httpx.AsyncClient, sample_trades):
+        response = await client.get("/api/trades?limit=1")
+        assert response.status_code == 200
+        first = response.json()
+        cursor = first["pagination"]["next_cursor"]
+        assert cursor is not None
+
+        response = await client.get(f"/api/trades?limit=1&cursor={cursor}")
+        assert response.status_code == 200
+        second = response.json()
+        assert len(second["trades"]) == 1
+        assert second["trades"][0]["id"] != first["trades"][0]["id"]
+        assert second["pagination"]["has_more"] == False
+        assert second["pagination"]["next_cursor"] is None
+
+        # Only the first page pays for the filtered COUNT unless asked
+        assert first["pagination"]["total"] == 2
+        assert second["pagination"]["total"] is None
+        response = await client.get(f"/api/trades?limit=1&cursor={cursor}&include_total=true")
+        assert response.json()["pagination"]["total"] == 2
+
+    async def test_export_trades_ndjson(self, client: httpx.AsyncClient, sample_trades):
+        response = await client.get("/api/trades.ndjson")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert len(lines) == 2
+        assert lines[0]["ticker"] == "MSFT"
+
+    async def test_get_trades_invalid_cursor(self, client: httpx.AsyncClient):
+        response = await client.get("/api/trades?cursor=not-a-cursor")
+        assert response.status_code == 400
+
 class TestPoliticianEndpoints:
-    def test_get_politicians(self, client: TestClient, sample_politician):
-        response = client.get("/api/politicians")
+    async def test_get_politicians(self, client: httpx.AsyncClient, sample_politician):
+        response = await client.get("/api/politicians")
         assert response.status_code == 200
-        data = response.json()
-        assert "politicians" in data
-        assert len(data["politicians"]) == 1
+        page = PoliticianListResponse.model_validate(response.json())
+        assert len(page.politicians) == 1
 
-        politician = data["politicians"][0]
-        assert politician["name"] == "Nancy Pelosi"
-        assert politician["chamber"] == "House"
-        assert politician["party"] == "Democratic"
+        politician = page.politicians[0]
+        assert politician.name == "Nancy Pelosi"
+        assert politician.chamber == "House"
+        assert politician.party == "Democratic"
     
-    def test_get_politician_trades(self, client: TestClient, sample_politician, sample_trades):
+    async def test_get_politician_trades(self, client: httpx.AsyncClient, sample_politician, sample_trades):
         politician_id = sample_politician.id
 
-        response = client.get(f"/api/politicians/{politician_id}/trades")
+        response = await client.get(f"/api/politicians/{politician_id}/trades")
 
         assert response.status_code == 200
-        data = response.json()
-        assert "politician" in data
-        assert "trades" in data
-        assert len(data["trades"]) == 2
-        assert data["politician"]["name"] == "Nancy Pelosi"
+        page = PoliticianTradesResponse.model_validate(response.json())
+        assert len(page.trades) == 2
+        assert page.politician.name == "Nancy Pelosi"
 
-    def test_get_nonexistent_politician_trades(self, client: TestClient):
-        response = client.get("/api/politicians/99999/trades")
+    async def test_get_nonexistent_politician_trades(self, client: httpx.AsyncClient):
+        response = await client.get("/api/politicians/99999/trades")
 
         assert response.status_code == 404
 
+def _stream_pages(*pages):
+    # Stands in for FMPClient.stream_trades; no request leaves the process
+    async def stream_trades(self, limit_per_chamber = 50, page_size = 500):
+        for page in pages:
+            yield page
+    return stream_trades
+
+def _sync(db_session, *pages):
+    with mock.patch.object(FMPClient, "stream_trades", _stream_pages(*pages)):
+        return TradeService.sync_trades_from_fmp(db_session, 5)
+
 class TestAnalyticsEndpoints:
-    def test_analytics_summary(self, client: TestClient, sample_trades):
-        response = client.get("/api/analytics/summary")
+    async def test_analytics_summary(self, client: httpx.AsyncClient, sample_trades):
+        response = await client.get("/api/analytics/summary")
 
         assert response.status_code == 200
         data = response.json()
@@ -203,53 +388,258 @@ class TestAnalyticsEndpoints:
         assert summary["total_trades"] == 2
         assert summary["total_volume"] > 0
         assert summary["average_trade_size"] > 0
+        assert data["top_traders"] == [
+            {"politician": "Nancy Pelosi", "trade_count": 2, "total_volume": 60000.0}
+        ]
+        assert data["party_breakdown"] == [
+            {"party": "Democratic", "trade_count": 2, "total_volume": 60000.0}
+        ]
+
+    async def test_analytics_summary_after_sync(self, client: httpx.AsyncClient, db_session, sample_politician, mock_fmp_data):
+        db_session.add(Politician(name = "Another Politician", chamber = "Senate", party = "Republican"))
+        db_session.commit()
+        pelosi_trade = TradeData(
+            "Nancy Pelosi", "House", "NVDA", "Buy",
+            20000.0, datetime(2024, 1, 5), datetime(2024, 1, 20)
+        )
+        _sync(db_session, mock_fmp_data + [pelosi_trade])
+
+        response = await client.get("/api/analytics/summary")
+
+        assert response.status_code == 200
+        data = response.json()
+        # UNION ALL loses the branch's ORDER BY; the service re-sorts by volume
+        assert data["top_traders"] == [
+            {"politician": "Another Politician", "trade_count": 1, "total_volume": 75000.0},
+            {"politician": "Test Politician", "trade_count": 1, "total_volume": 50000.0},
+            {"politician": "Nancy Pelosi", "trade_count": 1, "total_volume": 20000.0},
+        ]
+        # Synced trades take the party of a known politician; new ones have none yet
+        party_rows = sorted(data["party_breakdown"], key = lambda row: row["party"] or "")
+        assert party_rows == [
+            {"party": None, "trade_count": 1, "total_volume": 50000.0},
+            {"party": "Democratic", "trade_count": 1, "total_volume": 20000.0},
+            {"party": "Republican", "trade_count": 1, "total_volume": 75000.0},
+        ]
+
+class TestTradeSync:
+    async def test_sync_upserts_on_dedup_key(self, db_session, sample_politician, mock_fmp_data):
+        first, second = mock_fmp_data
+        # A repeat inside one page and one across pages must both collapse
+        stats = _sync(db_session, [first, first], [second, first])
+
+        assert stats["success"] == True
+        assert stats["errors"] == []
+        assert stats["trades_fetched"] == 4
+        assert stats["trades_stored"] == 2
+        assert stats["trades_updated"] == 0
+        assert stats["politicians_created"] == 2
+        assert stats["politicians_updated"] == 0
+
+        revised = TradeData(
+            first.politician_name, first.chamber, first.ticker, first.trade_type,
+            90000.0, first.transaction_date, first.disclosure_date
+        )
+        stats = _sync(db_session, [revised, second])
+
+        assert stats["success"] == True
+        assert stats["trades_stored"] == 0
+        assert stats["trades_updated"] == 2
+        assert stats["politicians_created"] == 0
+        assert stats["politicians_updated"] == 2
+
+        trades = db_session.execute(
+            select(Trade.politician_name, Trade.ticker, Trade.estimated_amount, Trade.disclosure_delay_days)
+            .order_by(Trade.ticker)
+        ).all()
+        assert trades == [
+            ("Test Politician", "GOOGL", 90000.0, 15),
+            ("Another Politician", "TSLA", 75000.0, 16),
+        ]
+
+    async def test_sync_recomputes_politician_stats(self, db_session, sample_politician, mock_fmp_data):
+        first, second = mock_fmp_data
+        later = TradeData(
+            first.politician_name, first.chamber, "NVDA", "Buy",
+            30000.0, datetime(2024, 2, 1), datetime(2024, 2, 20)
+        )
+        _sync(db_session, [first, second, later])
+
+        politicians = db_session.execute(
+            select(
+                Politician.name, Politician.chamber, Politician.total_trades,
+                Politician.total_estimated_volume, Politician.average_trade_size, Politician.last_trade_date
+            ).order_by(Politician.name)
+        ).all()
+        assert politicians == [
+            ("Another Politician", "Senate", 1, 75000.0, 75000.0, datetime(2024, 1, 12)),
+            # Seeded with stale totals and no trades: zeroed by the sync
+            ("Nancy Pelosi", "House", 0, 0.0, 0.0, None),
+            ("Test Politician", "House", 2, 80000.0, 40000.0, datetime(2024, 2, 1)),
+        ]
+
+        trade_politician_ids = db_session.execute(
+            select(Trade.politician_id).where(Trade.politician_name == "Test Politician")
+        ).scalars().all()
+        test_politician_id = db_session.execute(
+            select(Politician.id).where(Politician.name == "Test Politician")
+        ).scalar_one()
+        assert trade_politician_ids == [test_politician_id, test_politician_id]
+
+class TestRankingCache:
+    def _top_names(self, db_session):
+        return [politician["name"] for politician in PoliticianService.get_top_traders(db_session)]
+
+    async def test_sync_clears_cached_rankings(self, fake_redis, db_session, sample_politician, mock_fmp_data):
+        assert self._top_names(db_session) == ["Nancy Pelosi"]
+        fake_redis.store["ct:api:politicians:recent:30:10"] = b"[]"
+        assert "ct:api:politicians:top:10" in fake_redis.store
+
+        with mock.patch.object(services, "clear_namespace", wraps = cache.clear_namespace) as clear:
+            stats = _sync(db_session, mock_fmp_data)
+
+        assert stats["success"] == True
+        clear.assert_called_once_with()
+        assert not any(key.startswith("ct:api:politicians:") for key in fake_redis.store)
+        # Rebuilt from the recomputed totals; Pelosi has no trades any more
+        assert self._top_names(db_session) == ["Another Politician", "Test Politician"]
+
+    async def test_stats_task_clears_cached_rankings(self, fake_redis, db_session, sample_politician):
+        assert self._top_names(db_session) == ["Nancy Pelosi"]
+
+        with mock.patch.object(tasks, "TaskSession", mock.Mock(return_value = db_session)):
+            tasks.update_politician_stats_task.apply().get()
+
+        assert "ct:api:politicians:top:10" not in fake_redis.store
+        assert self._top_names(db_session) == []
+
+_ORDER = {"id": "order-1", "qty": "4.5", "filled_avg_price": "222.0"}
+
+class TestCopyTrading:
+    def _follow_pelosi(self, db_session, test_user):
+        db_session.add_all([
+            TradingAccount(user_id = test_user.id, alpaca_api_key = "key", alpaca_secret_key = "secret", is_active = True),
+            BotSettings(user_id = test_user.id, is_active = True, max_trade_amount = 1000.0),
+            BotFollow(user_id = test_user.id, politician_name = "Nancy Pelosi")
+        ])
+        # Both sample trades were just synced; only the $25k AAPL buy meets the copy rule
+        db_session.execute(update(Trade).values(created_at = datetime.now(timezone.utc)))
+        db_session.commit()
+
+    async def test_only_copyable_trades_are_claimed_and_copied(self, db_session, test_user, sample_trades):
+        self._follow_pelosi(db_session, test_user)
+        buy, sell = sample_trades
+
+        task_session = mock.Mock(return_value = db_session)
+        with mock.patch.object(trading_tasks, "TaskSession", task_session), \
+                mock.patch.object(AsyncAlpacaClient, "buy_stock", mock.AsyncMock(return_value = _ORDER)) as buy_stock:
+            trading_tasks.process_new_congressional_trades.apply().get()
+
+        buy_stock.assert_awaited_once_with("AAPL", 1000.0)
+
+        bot_trades = db_session.execute(
+            select(BotTrade.user_id, BotTrade.congressional_trade_id, BotTrade.symbol, BotTrade.quantity, BotTrade.price, BotTrade.alpaca_order_id)
+        ).all()
+        assert bot_trades == [(test_user.id, buy.id, "AAPL", 4.5, 222.0, "order-1")]
+
+        claimed = dict(db_session.execute(select(Trade.id, Trade.processed_for_trading)).all())
+        assert claimed == {buy.id: True, sell.id: False}
+
+    async def test_claim_survives_a_failed_bot_trade_insert(self, db_session, test_user, sample_trades):
+        self._follow_pelosi(db_session, test_user)
+        buy, sell = sample_trades
+
+        task_session = mock.Mock(return_value = db_session)
+        with mock.patch.object(trading_tasks, "TaskSession", task_session), \
+                mock.patch.object(AsyncAlpacaClient, "buy_stock", mock.AsyncMock(return_value = _ORDER)) as buy_stock, \
+                mock.patch.object(trading_service, "insert", side_effect = RuntimeError("insert failed")):
+            with pytest.raises(RuntimeError):
+                trading_tasks.process_new_congressional_trades.apply().get()
+
+        # The order went out; replaying the trade would buy it twice
+        buy_stock.assert_awaited_once()
+        assert db_session.scalars(select(BotTrade)).all() == []
+
+        claimed = dict(db_session.execute(select(Trade.id, Trade.processed_for_trading)).all())
+        assert claimed == {buy.id: True, sell.id: False}
 
 class TestAdminEndpoints:
-    def test_admin_sync_requires_auth(self, client: TestClient):
-        response = client.post("/admin/sync-trades")
+    async def test_admin_sync_requires_auth(self, client: httpx.AsyncClient):
+        response = await client.post("/admin/sync-trades")
 
-        assert response.status_code == 401
+        assert response.status_code == 403
     
-    def test_admin_sync_with_auth(self, client: TestClient, auth_headers):
-        response = client.post("/admin/sync-trades", headers = auth_headers)
+    async def test_admin_sync_with_auth(self, client: httpx.AsyncClient, auth_headers):
+        with mock.patch.object(manual_sync_task, "apply_async", return_value = mock.Mock(id = "task-123")) as apply_async:
+            response = await client.post("/admin/sync-trades", headers = auth_headers)
+
+        assert response.status_code == 202
+        data = response.json()
+        assert "message" in data
+        assert data["background_task_id"] == "task-123"
+        assert data["status_url"] == "/admin/task-status/task-123"
+        apply_async.assert_called_once_with(args = (20,), retry = False)
 
-        assert response.status_code in [200, 500]
+    async def test_admin_sync_broker_down(self, client: httpx.AsyncClient, auth_headers):
+        with mock.patch.object(manual_sync_task, "apply_async", side_effect = ConnectionError("broker down")):
+            response = await client.post("/admin/sync-trades", headers = auth_headers)
 
-        if response.status_code == 200:
-            data = response.json()
-            assert "message" in data
-            assert "direct_sync" in data
+        assert response.status_code == 503
 
-    def test_system_status_with_auth(self, client: TestClient, auth_headers):
-        response = client.get("/admin/system-status", headers = auth_headers)
+    async def test_admin_sync_wait_runs_inline(self, client: httpx.AsyncClient, auth_headers):
+        sync_result = {"success": True, "trades_stored": 2, "trades_updated": 0, "errors": []}
+        with mock.patch.object(TradeService, "sync_trades_from_fmp", return_value = sync_result) as sync:
+            response = await client.post("/admin/sync-trades?wait=true&limit_per_chamber=5", headers = auth_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert "message" in data
+        assert data["direct_sync"] == sync_result
+        assert sync.call_args.args[1] == 5
+
+    async def test_scheduled_sync_task_succeeds(self):
+        sync_result = {"success": True, "trades_stored": 2, "trades_updated": 1, "errors": []}
+        with mock.patch.object(TradeService, "sync_trades_from_fmp", return_value = sync_result), \
+                mock.patch.object(sync_trades_task, "retry") as retry:
+            result = sync_trades_task.apply(args = (5,)).get()
+
+        assert result["success"] == True
+        assert result["limit_per_chamber"] == 5
+        retry.assert_not_called()
+
+    async def test_system_status_with_auth(self, client: httpx.AsyncClient, auth_headers):
+        redis_client = mock.Mock()
+        redis_client.connection_pool.connection_kwargs = {"host": "redis", "port": 6379}
+        inspector = mock.Mock()
+        inspector.stats.return_value = {"worker@test": {}}
+
+        app.dependency_overrides[get_redis_client] = lambda: redis_client
+        with mock.patch.object(celery_app.control, "inspect", return_value = inspector):
+            response = await client.get("/admin/system-status", headers = auth_headers)
 
         assert response.status_code == 200
         data = response.json()
         assert "database" in data
         assert "timestamp" in data
         assert data["database"]["status"] == "connected"
+        assert data["redis"] == {"status": "connected", "host": "redis:6379"}
+        assert data["celery"]["status"] == "connected"
+        assert data["celery"]["worker_names"] == ["worker@test"]
 
 class TestErrorHandling:
-    def test_invalid_endpoint(self, client: TestClient):
-        response = client.get("/does-not-exist")
+    async def test_invalid_endpoint(self, client: httpx.AsyncClient):
+        response = await client.get("/does-not-exist")
         assert response.status_code == 404
 
-    def test_invalid_method(self, client: TestClient):
-        response = client.post("/")
+    async def test_invalid_method(self, client: httpx.AsyncClient):
+        response = await client.post("/")
 
         assert response.status_code == 405
 
-    def test_invalid_json(self, client: TestClient):
-        response = client.post(
+    async def test_invalid_json(self, client: httpx.AsyncClient):
+        response = await client.post(
             "/auth/login",
-            data = "invalid json{",
+            content = "invalid json{",
             headers = {"Content-type": "application/json"}
         )
         assert response.status_code == 422
-
-    def test_missing_required_fields(self, client: TestClient):
-        response = client.post("/auth/register", json = {"email": "test@test.com"})
-        assert response.status_code == 422
-
-        response = client.post("/auth/login", json = {"password": "test123"})
-
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+import pytest
+import redis
+
+from app import cache
+
+class RaisingRedis:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, key):
+        self.calls += 1
+        raise redis.ConnectionError("connection refused")
+
+    set = delete = get
+
+def _counted(result):
+    calls = []
+
+    @cache.cached(expire = 60)
+    def endpoint(limit: int = 10, db = None):
+        calls.append(limit)
+        return result
+
+    return endpoint, calls
+
+class TestCachedDecorator:
+    def test_key_skips_db_and_sorts_params(self):
+        def endpoint():
+            pass
+
+        key = cache._build_key("api", endpoint, {"offset": 5, "db": object(), "limit": 10})
+
+        assert key == f"api:{__name__}.endpoint:limit=10&offset=5"
+
+    def test_miss_then_hit(self, fake_redis):
+        endpoint, calls = _counted({"rows": [1, 2]})
+
+        assert endpoint(limit = 10, db = object()) == {"rows": [1, 2]}
+        # A different session object must still hit the same entry
+        assert endpoint(limit = 10, db = object()) == {"rows": [1, 2]}
+        assert calls == [10]
+        assert list(fake_redis.store) == [f"ct:api:{__name__}.endpoint:limit=10"]
+
+        endpoint(limit = 20, db = object())
+        assert calls == [10, 20]
+
+    def test_non_dict_results_are_not_cached(self, fake_redis):
+        endpoint, calls = _counted(["not", "a", "dict"])
+
+        endpoint(limit = 10)
+        endpoint(limit = 10)
+
+        assert calls == [10, 10]
+        assert fake_redis.store == {}
+
+    def test_redis_error_bypasses_cache_for_retry_window(self, fake_redis, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic = lambda: clock[0]))
+        raising = RaisingRedis()
+        monkeypatch.setattr(cache, "_client", raising)
+        endpoint, calls = _counted({"rows": []})
+
+        # Fails open: the endpoint still answers
+        assert endpoint(limit = 10) == {"rows": []}
+        assert raising.calls == 1
+
+        # Redis is back, but inside the window nobody touches it
+        monkeypatch.setattr(cache, "_client", fake_redis)
+        clock[0] += cache._RETRY_AFTER_SECONDS - 1
+        endpoint(limit = 10)
+        assert fake_redis.store == {}
+        assert len(calls) == 2
+
+        clock[0] += 2
+        endpoint(limit = 10)
+        endpoint(limit = 10)
+        assert len(calls) == 3
+        assert list(fake_redis.store) == [f"ct:api:{__name__}.endpoint:limit=10"]
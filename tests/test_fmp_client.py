@@ -0,0 +1,271 @@
+import asyncio
+import threading
+from datetime import datetime
+import pytest
+import orjson
+
+from app.fmp_client import FMPClient, TradeData, iter_sync
+
+pytestmark = pytest.mark.asyncio
+
+# Kept before any test patches asyncio.sleep
+_real_sleep = asyncio.sleep
+
+class FakeResponse:
+    def __init__(self, status = 200, body = None, headers = None):
+        self.status = status
+        self.headers = headers or {}
+        self._body = orjson.dumps(body if body is not None else [])
+
+    async def read(self):
+        return self._body
+
+    async def text(self):
+        return self._body.decode()
+
+    async def __aenter__(self):
+        # Yield once so concurrent callers really interleave
+        await _real_sleep(0)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+class FakeSession:
+    """Serves queued responses (the last one repeats) and records each GET."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, params = None):
+        self.calls.append((url, dict(params or {})))
+        if len(self.responses) > 1:
+            return self.responses.pop(0)
+        return self.responses[0]
+
+def _client(*responses) -> FMPClient:
+    client = FMPClient("test-key")
+    client.session = FakeSession(*responses)
+    # No spacing between sends; backoff sleeps are what the tests look at
+    client.min_request_interval = 0
+    return client
+
+class TestResponseCache:
+    async def test_concurrent_misses_make_one_upstream_call(self):
+        client = _client(FakeResponse(body = [{"ticker": "AAPL"}]))
+
+        results = await asyncio.gather(*(
+            client._make_request("v4/senate-trading", {"limit": 10}) for _ in range(8)
+        ))
+
+        assert len(client.session.calls) == 1
+        assert results == [[{"ticker": "AAPL"}]] * 8
+        # The single-flight lock is dropped once the entry is filled
+        assert client._inflight == {}
+
+    async def test_failed_fill_releases_lock(self):
+        client = _client(FakeResponse(status = 500))
+
+        with pytest.raises(Exception):
+            await client._make_request("v4/senate-trading", {"limit": 10})
+
+        assert client._inflight == {}
+        assert len(client.cache) == 0
+
+    async def test_cache_key_excludes_api_key(self):
+        client = _client(FakeResponse(body = [{"ticker": "AAPL"}]))
+        params = {"limit": 10}
+
+        await client._make_request("v4/senate-trading", params)
+        # Rotated key, same query: served from the entry the old key filled
+        client.api_key = "rotated-key"
+        await client._make_request("v4/senate-trading", params)
+
+        assert len(client.session.calls) == 1
+        assert client.session.calls[0][1] == {"limit": 10, "apikey": "test-key"}
+        assert list(client.cache.keys()) == [("v4/senate-trading", (("limit", 10),))]
+        assert "test-key" not in repr(list(client.cache.keys()))
+        # The caller's dict is never given the secret
+        assert params == {"limit": 10}
+
+    async def test_explicit_apikey_param_is_not_part_of_the_key(self):
+        client = _client(FakeResponse(body = []))
+
+        await client._make_request("v4/house-trading", {"limit": 5, "apikey": "first"})
+        await client._make_request("v4/house-trading", {"limit": 5, "apikey": "second"})
+
+        assert len(client.session.calls) == 1
+        assert list(client.cache.keys()) == [("v4/house-trading", (("limit", 5),))]
+
+class TestRateLimitBackoff:
+    @pytest.fixture
+    def sleeps(self, monkeypatch):
+        # Record backoff sleeps instead of waiting them out
+        requested = []
+
+        async def fake_sleep(delay):
+            requested.append(delay)
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        return requested
+
+    async def test_retries_429_then_returns_data(self, sleeps):
+        client = _client(
+            FakeResponse(status = 429, headers = {"Retry-After": "7"}),
+            FakeResponse(status = 429),
+            FakeResponse(body = [{"ticker": "AAPL"}])
+        )
+
+        data = await client._fetch("v4/senate-trading", {"limit": 10})
+
+        assert data == [{"ticker": "AAPL"}]
+        assert len(client.session.calls) == 3
+        assert len(sleeps) == 2
+        # Retry-After wins; without it, exponential backoff plus up to 1s jitter
+        assert sleeps[0] == 7.0
+        assert 2 <= sleeps[1] <= 3
+
+    async def test_backoff_is_capped(self):
+        client = _client()
+        response = FakeResponse(status = 429)
+
+        delays = [client._retry_delay(response, attempt) for attempt in range(10)]
+
+        assert all(min(60, 2 ** attempt) <= delay <= min(60, 2 ** attempt) + 1 for attempt, delay in enumerate(delays))
+        assert max(delays) <= 61
+
+    async def test_gives_up_after_max_retries(self, sleeps):
+        client = _client(FakeResponse(status = 429, headers = {"Retry-After": "1"}))
+        client.max_retries = 3
+
+        with pytest.raises(Exception, match = "gave up after 3 retries"):
+            await client._fetch("v4/senate-trading", {"limit": 10})
+
+        # No pointless wait after the final attempt
+        assert len(client.session.calls) == 4
+        assert sleeps == [1.0, 1.0, 1.0]
+
+class TestAmountParsing:
+    @pytest.mark.parametrize("amount_str,expected", [
+        ("$1,001 - $15,000", 8000.5),
+        ("$15,001 - $50,000", 32500.5),
+        ("$1,001-$15,000", 8000.5),
+        ("1001 - 15000", 8000.5),
+        ("$15,000", 15000.0),
+        ("$2,500.50", 2500.5),
+        # Open-ended brackets: the lower bound, so they still pass MIN_COPY_AMOUNT
+        ("Over $50,000", 50000.0),
+        ("over $1,000,000", 1000000.0),
+        ("$50,000,001 +", 50000001.0),
+        ("", 0.0),
+        (None, 0.0),
+        ("   ", 0.0),
+        ("Unknown", 0.0),
+        ("Spouse/DC 2", 0.0),
+        ("$1,001 -", 0.0),
+        ("$", 0.0),
+        (",", 0.0),
+    ], ids = [
+        "range", "range_upper", "range_no_spaces", "range_no_symbols", "single", "cents",
+        "over", "over_lowercase", "plus", "empty", "none", "blank", "word",
+        "trailing_digits", "open_range", "dollar_only", "comma_only",
+    ])
+    async def test_parse_amount_range(self, amount_str, expected):
+        assert FMPClient("test-key")._parse_amount_range(amount_str) == expected
+
+def _raw_trade(name, ticker, transaction_date, publication_date = "2024-03-01"):
+    return {
+        "representative": f"Hon. {name}",
+        "transaction": "Purchase",
+        "ticker": ticker,
+        "transactionDate": transaction_date,
+        "publicationDate": publication_date,
+        "amount": "$1,001 - $15,000"
+    }
+
+class TestMergedOrder:
+    async def test_merge_matches_full_sort(self):
+        raw = {
+            # Out of order, with ties inside and across chambers, and rows the
+            # transform drops for a missing or unparseable date
+            "v4/senate-trading": [
+                _raw_trade("A", "S1", "2024-01-10"),
+                _raw_trade("B", "S2", "2024-02-01"),
+                _raw_trade("C", "S3", "2024-01-10"),
+                _raw_trade("D", "S4", None),
+                _raw_trade("E", "S5", "2024-01-20"),
+            ],
+            "v4/house-trading": [
+                _raw_trade("F", "H1", "2024-02-01"),
+                _raw_trade("G", "H2", "2024-01-10"),
+                _raw_trade("H", "H3", "not-a-date"),
+                _raw_trade("I", "H4", "2024-01-05"),
+                _raw_trade("J", "H5", "2024-01-20", publication_date = None),
+            ],
+        }
+        client = FMPClient("test-key")
+
+        async def make_request(endpoint, params = None):
+            return raw[endpoint]
+
+        client._make_request = make_request
+        merged = await client.get_all_trades(limit_per_chamber = 10)
+
+        # The previous implementation: concatenate by chamber, one stable sort
+        expected = [
+            client._transform_trade_data(item, chamber)
+            for chamber, endpoint in FMPClient.CHAMBER_ENDPOINTS for item in raw[endpoint]
+        ]
+        expected = [trade for trade in expected if trade is not None]
+        expected.sort(key = lambda x: x.transaction_date, reverse = True)
+
+        assert [trade.ticker for trade in merged] == [trade.ticker for trade in expected]
+        assert [trade.ticker for trade in merged] == ["S2", "H1", "S5", "S1", "S3", "H2", "H4"]
+
+class TestSyncBridge:
+    async def test_early_exit_closes_the_generator(self):
+        closed = threading.Event()
+        produced = []
+
+        async def pages():
+            try:
+                for number in range(5):
+                    produced.append(number)
+                    yield [number]
+            finally:
+                closed.set()
+
+        for page in iter_sync(pages()):
+            assert page == [0]
+            break
+
+        # Closed on the background loop before the loop statement finished
+        assert closed.is_set()
+        assert produced == [0]
+
+    async def test_early_exit_cancels_the_pending_chamber(self):
+        cancelled = threading.Event()
+        senate = [
+            TradeData(f"Senator {number}", "Senate", "AAPL", "Buy", 1000.0, datetime(2024, 1, number + 1), datetime(2024, 2, 1))
+            for number in range(3)
+        ]
+
+        async def get_chamber_trades(chamber, endpoint, limit = 100):
+            if chamber == "Senate":
+                return senate
+            try:
+                # House never answers
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        client = FMPClient("test-key")
+        client._get_chamber_trades = get_chamber_trades
+
+        for page in iter_sync(client.stream_trades(limit_per_chamber = 10, page_size = 1)):
+            assert page == senate[:1]
+            break
+
+        assert cancelled.wait(timeout = 5)